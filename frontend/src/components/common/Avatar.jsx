@@ -1,8 +1,17 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import { cn } from '../../utils/helpers';
 import { User } from 'lucide-react';
 
-const Avatar = ({ src, alt, size = 'md', className }) => {
+// Smallest server thumbnail that stays sharp at each size on 2x screens
+const thumbnailSizes = {
+    sm: '64',
+    md: '64',
+    lg: '128',
+    xl: '512',
+};
+
+const Avatar = ({ src, thumbnails, alt, size = 'md', className }) => {
+    const [thumbnailFailed, setThumbnailFailed] = useState(false);
     const sizes = {
         sm: 'h-8 w-8',
         md: 'h-10 w-10',
@@ -10,6 +19,11 @@ const Avatar = ({ src, alt, size = 'md', className }) => {
         xl: 'h-24 w-24',
     };
 
+    // Thumbnails are generated after upload; fall back to the original until then
+    const thumbnail = thumbnails?.[thumbnailSizes[size]];
+    useEffect(() => setThumbnailFailed(false), [thumbnail]);
+    const imageSrc = thumbnail && !thumbnailFailed ? thumbnail : src;
+
     return (
         <div
             className={cn(
@@ -18,9 +32,10 @@ const Avatar = ({ src, alt, size = 'md', className }) => {
                 className
             )}
         >
-            {src ? (
+            {imageSrc ? (
                 <img
-                    src={src}
+                    src={imageSrc}
+                    onError={thumbnail && !thumbnailFailed ? () => setThumbnailFailed(true) : undefined}
                     alt={alt || 'Avatar'}
                     className="aspect-square h-full w-full object-cover"
                 />
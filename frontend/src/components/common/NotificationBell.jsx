@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Bell } from 'lucide-react';
 import { notificationService } from '../../services/notificationService';
 import NotificationDropdown from './NotificationDropdown';
@@ -7,6 +7,7 @@ const NotificationBell = () => {
     const [unreadCount, setUnreadCount] = useState(0);
     const [isOpen, setIsOpen] = useState(false);
     const [loading, setLoading] = useState(false);
+    const streamLive = useRef(true);
 
     // Fetch unread count
     const fetchUnreadCount = async () => {
@@ -19,14 +20,22 @@ const NotificationBell = () => {
     };
 
     useEffect(() => {
-        fetchUnreadCount();
+        // The server pushes the unread count on connect and on every change;
+        // polling is only a fallback when the stream is unavailable
+        let interval = null;
+        const stream = notificationService.openStream({
+            onUnreadCount: setUnreadCount,
+            onUnavailable: () => {
+                streamLive.current = false;
+                fetchUnreadCount();
+                interval = interval || setInterval(fetchUnreadCount, 30000);
+            },
+        });
 
-        // Poll for new notifications every 10 seconds
-        const interval = setInterval(() => {
-            fetchUnreadCount();
-        }, 10000);
-
-        return () => clearInterval(interval);
+        return () => {
+            stream.close();
+            clearInterval(interval);
+        };
     }, []);
 
     const handleToggle = () => {
@@ -34,8 +43,10 @@ const NotificationBell = () => {
     };
 
     const handleNotificationRead = () => {
-        // Refresh count when notification is read
-        fetchUnreadCount();
+        // Refresh count when notification is read (the stream pushes it otherwise)
+        if (!streamLive.current) {
+            fetchUnreadCount();
+        }
     };
 
     return (
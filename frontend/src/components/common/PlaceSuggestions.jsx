@@ -0,0 +1,44 @@
+import React, { useState, useEffect } from 'react';
+import { rideService } from '../../services/rideService';
+
+/**
+ * <datalist> of place suggestions for a text input (link it with list={id}).
+ * Suggestions come from the ride autocomplete endpoint as the query changes.
+ */
+const PlaceSuggestions = ({ id, query }) => {
+    const [places, setPlaces] = useState([]);
+
+    useEffect(() => {
+        const q = (query || '').trim();
+        if (!q) {
+            setPlaces([]);
+            return;
+        }
+
+        let active = true;
+        // Debounce keystrokes
+        const timer = setTimeout(async () => {
+            try {
+                const data = await rideService.autocompletePlaces(q);
+                if (active) setPlaces(data.results);
+            } catch (error) {
+                console.error('Error fetching place suggestions:', error);
+            }
+        }, 150);
+
+        return () => {
+            active = false;
+            clearTimeout(timer);
+        };
+    }, [query]);
+
+    return (
+        <datalist id={id}>
+            {places.map((place) => (
+                <option key={place.name} value={place.name} />
+            ))}
+        </datalist>
+    );
+};
+
+export default PlaceSuggestions;
@@ -72,7 +72,7 @@ const Navbar = () => {
                                         onClick={() => setIsUserMenuOpen(!isUserMenuOpen)}
                                         className="flex items-center gap-2 focus:outline-none"
                                     >
-                                        <Avatar src={user.avatar} size="sm" className="cursor-pointer ring-2 ring-transparent hover:ring-primary/20 transition-all" />
+                                        <Avatar src={user.avatar} thumbnails={user.avatar_thumbnails} size="sm" className="cursor-pointer ring-2 ring-transparent hover:ring-primary/20 transition-all" />
                                     </button>
 
                                     {isUserMenuOpen && (
@@ -168,7 +168,7 @@ const Navbar = () => {
                             <>
                                 <div className="px-4 py-2">
                                     <div className="flex items-center gap-3">
-                                        <Avatar src={user.avatar} size="sm" />
+                                        <Avatar src={user.avatar} thumbnails={user.avatar_thumbnails} size="sm" />
                                         <div>
                                             <p className="text-sm font-medium text-slate-900">{user.name}</p>
                                             <p className="text-xs text-slate-500">{user.email}</p>
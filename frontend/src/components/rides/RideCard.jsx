@@ -42,7 +42,7 @@ const RideCard = ({ ride }) => {
 
                     <div className="flex items-center justify-between mt-6 pt-4 border-t border-slate-100">
                         <div className="flex items-center gap-3">
-                            <Avatar src={ride.driver.avatar} alt={ride.driver.name} size="sm" />
+                            <Avatar src={ride.driver.avatar} thumbnails={ride.driver.avatar_thumbnails} alt={ride.driver.name} size="sm" />
                             <div>
                                 <div className="text-sm font-medium text-slate-900">{ride.driver.name}</div>
                                 <div className="flex items-center text-xs text-slate-500">
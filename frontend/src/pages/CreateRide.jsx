@@ -3,10 +3,11 @@ import { useForm } from 'react-hook-form';
 import { useNavigate } from 'react-router-dom';
 import { MapPin, Calendar, Clock, Car, DollarSign, Check, Upload, X } from 'lucide-react';
 import { rideService } from '../services/rideService';
+import PlaceSuggestions from '../components/common/PlaceSuggestions';
 
 const CreateRide = () => {
     const [step, setStep] = useState(1);
-    const { register, handleSubmit, formState: { errors } } = useForm();
+    const { register, handleSubmit, watch, formState: { errors } } = useForm();
     const navigate = useNavigate();
     const [isSubmitting, setIsSubmitting] = useState(false);
     const [carImage, setCarImage] = useState(null);
@@ -159,8 +160,10 @@ const CreateRide = () => {
                                             type="text"
                                             placeholder="City, Airport, or Station"
                                             className="w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent"
+                                            list="origin-suggestions"
                                             {...register('origin', { required: 'Origin is required' })}
                                         />
+                                        <PlaceSuggestions id="origin-suggestions" query={watch('origin')} />
                                         {errors.origin && <p className="text-red-500 text-sm mt-1">{errors.origin.message}</p>}
                                     </div>
 
@@ -173,8 +176,10 @@ const CreateRide = () => {
                                             type="text"
                                             placeholder="City, Airport, or Station"
                                             className="w-full px-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent"
+                                            list="destination-suggestions"
                                             {...register('destination', { required: 'Destination is required' })}
                                         />
+                                        <PlaceSuggestions id="destination-suggestions" query={watch('destination')} />
                                         {errors.destination && <p className="text-red-500 text-sm mt-1">{errors.destination.message}</p>}
                                     </div>
                                 </div>
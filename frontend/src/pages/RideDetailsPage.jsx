@@ -341,7 +341,7 @@ const RideDetailsPage = () => {
                                                 </div>
                                             )}
                                         </div>
-                                        <Avatar src={ride.driver.avatar} size="lg" />
+                                        <Avatar src={ride.driver.avatar} thumbnails={ride.driver.avatar_thumbnails} size="lg" />
                                     </div>
 
                                     {ride.description && (
@@ -808,7 +808,7 @@ const RideDetailsPage = () => {
                                 <div key={booking.id} className="bg-slate-50 rounded-lg p-4">
                                     <div className="flex items-start justify-between mb-3">
                                         <div className="flex items-center space-x-3">
-                                            <Avatar src={booking.passenger.avatar} />
+                                            <Avatar src={booking.passenger.avatar} thumbnails={booking.passenger.avatar_thumbnails} />
                                             <div>
                                                 <div className="font-medium text-slate-900">
                                                     {booking.passenger.full_name || booking.passenger.username}
@@ -882,7 +882,7 @@ const RideDetailsPage = () => {
             >
                 <div className="space-y-6">
                     <div className="text-center">
-                        <Avatar src={ride.driver.avatar} size="lg" className="mx-auto mb-3" />
+                        <Avatar src={ride.driver.avatar} thumbnails={ride.driver.avatar_thumbnails} size="lg" className="mx-auto mb-3" />
                         <h4 className="font-semibold text-slate-900">Driver: {ride.driver.full_name || `${ride.driver.first_name} ${ride.driver.last_name}`}</h4>
                         <p className="text-sm text-slate-500">{ride.origin} → {ride.destination}</p>
                     </div>
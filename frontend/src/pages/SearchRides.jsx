@@ -4,6 +4,7 @@ import { Filter, SlidersHorizontal, MapPin, Calendar } from 'lucide-react';
 import Layout from '../components/layout/Layout';
 import Button from '../components/common/Button';
 import Input from '../components/common/Input';
+import PlaceSuggestions from '../components/common/PlaceSuggestions';
 import RideCard from '../components/rides/RideCard';
 import { Card, CardContent, CardHeader, CardTitle } from '../components/common/Card';
 import { rideService } from '../services/rideService';
@@ -105,7 +106,9 @@ const SearchRides = () => {
                                     className="w-full pl-10 pr-4 py-2 rounded-lg border border-slate-300 focus:ring-2 focus:ring-primary focus:border-transparent outline-none"
                                     value={origin}
                                     onChange={(e) => setOrigin(e.target.value)}
+                                    list="origin-suggestions"
                                 />
+                                <PlaceSuggestions id="origin-suggestions" query={origin} />
                             </div>
                             <div className="relative">
                                 <MapPin className="absolute left-3 top-1/2 -translate-y-1/2 text-slate-400" size={18} />
@@ -115,7 +118,9 @@ const SearchRides = () => {
                                     className="w-full pl-10 pr-4 py-2 rounded-lg border border-slate-300 focus:ring-2 focus:ring-primary focus:border-transparent outline-none"
                                     value={destination}
                                     onChange={(e) => setDestination(e.target.value)}
+                                    list="destination-suggestions"
                                 />
+                                <PlaceSuggestions id="destination-suggestions" query={destination} />
                             </div>
                             <div className="relative">
                                 <Calendar className="absolute left-3 top-1/2 -translate-y-1/2 text-slate-400" size={18} />
@@ -1,4 +1,5 @@
 import api from './api';
+import { API_URL } from '../utils/constants';
 
 export const notificationService = {
     // Get all notifications
@@ -32,4 +33,63 @@ export const notificationService = {
         const response = await api.get('/notifications/unread-count/');
         return response.data;
     },
+
+    // Open the push stream (Server-Sent Events). Calls onUnreadCount with
+    // each new count and onNotification with each new notification;
+    // onUnavailable runs if the stream is refused or closed for good.
+    // Returns a handle whose close() stops the stream.
+    openStream: ({ onUnreadCount, onNotification, onUnavailable } = {}) => {
+        let source = null;
+        let retryTimer = null;
+        let closed = false;
+
+        // Each connection needs a fresh single-use ticket, so reconnects
+        // are made here instead of by the browser
+        const connect = async () => {
+            let ticket;
+            try {
+                const response = await api.post('/notifications/stream/ticket/');
+                ticket = response.data.ticket;
+            } catch (error) {
+                if (!closed) onUnavailable?.();
+                return;
+            }
+            if (closed) return;
+
+            let opened = false;
+            source = new EventSource(
+                `${API_URL}/notifications/stream/?ticket=${encodeURIComponent(ticket)}`
+            );
+            source.onopen = () => {
+                opened = true;
+            };
+            source.addEventListener('unread_count', (event) => {
+                onUnreadCount?.(JSON.parse(event.data).count);
+            });
+            source.addEventListener('notification', (event) => {
+                onNotification?.(JSON.parse(event.data));
+            });
+            // A stream that never opened was refused (e.g. not served over
+            // ASGI); one that dropped is reopened after a pause
+            source.onerror = () => {
+                source.close();
+                if (closed) return;
+                if (opened) {
+                    retryTimer = setTimeout(connect, 5000);
+                } else {
+                    onUnavailable?.();
+                }
+            };
+        };
+
+        connect();
+
+        return {
+            close: () => {
+                closed = true;
+                clearTimeout(retryTimer);
+                source?.close();
+            },
+        };
+    },
 };
@@ -7,9 +7,16 @@ export const rideService = {
         return response.data;
     },
 
-    // Search rides
+    // Search rides (dates are interpreted in the browser's time zone)
     search: async (filters) => {
-        const response = await api.get('/rides/search/', { params: filters });
+        const tz = Intl.DateTimeFormat().resolvedOptions().timeZone;
+        const response = await api.get('/rides/search/', { params: { tz, ...filters } });
+        return response.data;
+    },
+
+    // Place suggestions for origin/destination inputs
+    autocompletePlaces: async (q) => {
+        const response = await api.get('/rides/places/autocomplete/', { params: { q } });
         return response.data;
     },
 
@@ -12,7 +12,10 @@ export const userService = {
     },
     // Logout user
     logout: async () => {
-        const response = await api.post('/users/logout/');
+        // Send the refresh token so the server revokes it too
+        const response = await api.post('/users/logout/', {
+            refresh: localStorage.getItem('refreshToken'),
+        });
         return response.data;
     },
     // Get current user profile
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Booking
+from .models import Booking, EarningsEntry
 
 
 @admin.register(Booking)
@@ -23,4 +23,24 @@ class BookingAdmin(admin.ModelAdmin):
         }),
     )
     
-    readonly_fields = ('created_at', 'updated_at')
\ No newline at end of file
+    readonly_fields = ('created_at', 'updated_at')
+
+
+@admin.register(EarningsEntry)
+class EarningsEntryAdmin(admin.ModelAdmin):
+    """Read-only view of the append-only earnings ledger"""
+    list_display = ('id', 'driver', 'booking', 'kind', 'seats', 'unit_price',
+                    'amount', 'created_at')
+    list_filter = ('kind', 'created_at')
+    search_fields = ('driver__email',)
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at',)
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,87 @@
+from collections import defaultdict
+from django.db.models import Count, F, Q
+from apps.users.models import User
+from .models import EarningsEntry
+
+
+def _outstanding_credits(booking_ids):
+    """{booking_id: credits minus reversals} of bookings with entries"""
+    rows = EarningsEntry.objects.filter(booking_id__in=booking_ids).order_by().values(
+        'booking_id'
+    ).annotate(
+        credits=Count('id', filter=Q(kind='credit')),
+        reversals=Count('id', filter=Q(kind='reversal'))
+    )
+    return {row['booking_id']: row['credits'] - row['reversals'] for row in rows}
+
+
+def credit_booking(booking):
+    """
+    Credit the driver for an accepted booking at the ride's current price.
+    A booking accepted again after a cancellation is credited again; one
+    whose credit is still outstanding is not. Returns None when skipped.
+    """
+    if _outstanding_credits([booking.pk]).get(booking.pk, 0) > 0:
+        return None
+    
+    ride = booking.ride
+    entry = EarningsEntry.objects.create(
+        driver_id=ride.driver_id,
+        booking=booking,
+        kind='credit',
+        seats=booking.seats,
+        unit_price=ride.price,
+        amount=ride.price * booking.seats
+    )
+    add_to_totals({entry.driver_id: entry.amount})
+    return entry
+
+
+def reverse_bookings(booking_ids):
+    """
+    Append a reversal of each booking's latest credit, at the credited
+    amount rather than the ride's current price. Bookings without an
+    outstanding (not yet reversed) credit are skipped. Returns the
+    reversal entries.
+    """
+    outstanding = {
+        booking_id for booking_id, count in _outstanding_credits(booking_ids).items()
+        if count > 0
+    }
+    latest = {}
+    for credit in EarningsEntry.objects.filter(
+        booking_id__in=outstanding,
+        kind='credit'
+    ).order_by('id'):
+        latest[credit.booking_id] = credit
+    
+    reversals = [
+        EarningsEntry(
+            driver_id=credit.driver_id,
+            booking_id=credit.booking_id,
+            kind='reversal',
+            seats=credit.seats,
+            unit_price=credit.unit_price,
+            amount=-credit.amount
+        )
+        for credit in latest.values()
+    ]
+    if not reversals:
+        return []
+    
+    EarningsEntry.objects.bulk_create(reversals)
+    
+    deltas = defaultdict(int)
+    for entry in reversals:
+        deltas[entry.driver_id] += entry.amount
+    add_to_totals(deltas)
+    return reversals
+
+
+def add_to_totals(deltas):
+    """Apply {driver_id: amount} to the stored running totals"""
+    for driver_id, amount in deltas.items():
+        if amount:
+            User.objects.filter(pk=driver_id).update(
+                total_earnings=F('total_earnings') + amount
+            )
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from apps.bookings.models import EarningsEntry
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Reset the stored User.total_earnings running totals to the sum of each
+    driver's earnings ledger entries, where they have drifted
+    
+    Usage: python manage.py reconcile_earnings
+    """
+    help = 'Fix drift between driver earnings totals and the earnings ledger'
+
+    def handle(self, *args, **options):
+        amount = DecimalField(max_digits=12, decimal_places=2)
+        ledger = EarningsEntry.objects.filter(
+            driver=OuterRef('pk')
+        ).order_by().values('driver').annotate(total=Sum('amount')).values('total')
+        actual = Coalesce(Subquery(ledger, output_field=amount), 0, output_field=amount)
+        
+        fixed = User.objects.alias(actual=actual).exclude(
+            total_earnings=F('actual')
+        ).update(total_earnings=actual)
+        
+        self.stdout.write(self.style.SUCCESS(f'Fixed earnings totals for {fixed} users'))
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_initial'),
+        ('rides', '0004_ride_coordinates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['passenger', 'created_at'], name='bookings_bo_passeng_e582bb_idx'),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import DecimalField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def open_ledger(apps, schema_editor):
+    """
+    Credit every accepted booking at its ride's price (the only price on
+    record for bookings made before the ledger) and set the running totals
+    """
+    Booking = apps.get_model('bookings', 'Booking')
+    EarningsEntry = apps.get_model('bookings', 'EarningsEntry')
+    User = apps.get_model('users', 'User')
+    
+    batch = []
+    accepted = Booking.objects.filter(status='accepted').values_list(
+        'id', 'seats', 'ride__driver_id', 'ride__price'
+    )
+    for booking_id, seats, driver_id, price in accepted.iterator(chunk_size=1000):
+        batch.append(EarningsEntry(
+            driver_id=driver_id,
+            booking_id=booking_id,
+            kind='credit',
+            seats=seats,
+            unit_price=price,
+            amount=price * seats
+        ))
+        if len(batch) == 1000:
+            EarningsEntry.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        EarningsEntry.objects.bulk_create(batch)
+    
+    totals = EarningsEntry.objects.filter(driver=OuterRef('pk')).order_by().values(
+        'driver'
+    ).annotate(total=Sum('amount')).values('total')
+    User.objects.filter(pk__in=EarningsEntry.objects.values('driver')).update(
+        total_earnings=Coalesce(
+            Subquery(totals, output_field=DecimalField(max_digits=12, decimal_places=2)), 0,
+            output_field=DecimalField(max_digits=12, decimal_places=2)
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_keyset_indexes'),
+        ('users', '0006_total_earnings'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EarningsEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('credit', 'Credit'), ('reversal', 'Reversal')], max_length=10)),
+                ('seats', models.IntegerField()),
+                ('unit_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('booking', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='earnings_entries', to='bookings.booking')),
+                ('driver', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='earnings_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Earnings entries',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['driver', 'created_at'], name='bookings_ea_driver__c986da_idx')],
+                'constraints': [models.UniqueConstraint(fields=('booking', 'kind'), name='unique_earnings_entry_per_booking')],
+            },
+        ),
+        migrations.RunPython(open_ledger, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_earnings_ledger'),
+        ('rides', '0009_pending_review_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['passenger', 'status', 'ride'], name='bookings_bo_passeng_e7ac3e_idx'),
+        ),
+    ]
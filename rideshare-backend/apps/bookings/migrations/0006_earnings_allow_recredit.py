@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-18 04:15
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0005_pending_review_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='earningsentry',
+            name='unique_earnings_entry_per_booking',
+        ),
+    ]
@@ -1,7 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from apps.core.models import TimeStampedModel
 from apps.rides.models import Ride
+from .services import BookingConflict, reserve_seats, release_seats
 
 
 class Booking(TimeStampedModel):
@@ -40,6 +41,9 @@ class Booking(TimeStampedModel):
         indexes = [
             models.Index(fields=['status']),
             models.Index(fields=['ride', 'status']),
+            models.Index(fields=['passenger', 'created_at']),
+            # Rides a user took, for the pending-reviews anti-join
+            models.Index(fields=['passenger', 'status', 'ride']),
         ]
     
     def __init__(self, *args, **kwargs):
@@ -51,22 +55,88 @@ class Booking(TimeStampedModel):
         return f"{self.passenger.email} → {self.ride} ({self.status})"
     
     def save(self, *args, **kwargs):
-        """Override save to update ride seats when booking is accepted"""
-        is_new = self.pk is None
-        old_status = None
+        """
+        Override save to move ride seats when a booking is accepted or
+        an accepted booking is cancelled. The booking row is locked and
+        its stored status compared with the one this instance was loaded
+        with, so concurrent transitions can't apply twice. Earnings ledger
+        entries and trip statistics are recorded in the same transaction.
+        """
+        from apps.users import stats
+        from .earnings import credit_booking, reverse_bookings
         
-        if not is_new:
-            old_booking = Booking.objects.get(pk=self.pk)
-            old_status = old_booking.status
+        with transaction.atomic():
+            if self.pk is not None:
+                stored_status = Booking.objects.select_for_update().filter(
+                    pk=self.pk
+                ).values_list('status', flat=True).first()
+                if stored_status != self._original_status:
+                    raise BookingConflict(
+                        f"Booking {self.pk} is now {stored_status}"
+                    )
+            old_status = self._original_status
+            
+            # Reserve seats when booking status changes to accepted
+            if old_status != 'accepted' and self.status == 'accepted':
+                reserve_seats(self.ride, self.seats)
+            
+            # Restore seats when accepted booking is cancelled
+            elif old_status == 'accepted' and self.status == 'cancelled':
+                release_seats(self.ride, self.seats)
+            
+            super().save(*args, **kwargs)
+            
+            # Credit the driver at the booked price, or reverse that credit,
+            # and count the trip if the ride is already completed
+            if old_status != 'accepted' and self.status == 'accepted':
+                credit_booking(self)
+                stats.bookings_changed(self.ride_id, [self.passenger_id], 1)
+            elif old_status == 'accepted' and self.status == 'cancelled':
+                reverse_bookings([self.pk])
+                stats.bookings_changed(self.ride_id, [self.passenger_id], -1)
         
-        super().save(*args, **kwargs)
-        
-        # Update ride seats when booking status changes to accepted
-        if old_status != 'accepted' and self.status == 'accepted':
-            self.ride.seats_available -= self.seats
-            self.ride.save()
-        
-        # Restore seats when accepted booking is cancelled
-        elif old_status == 'accepted' and self.status == 'cancelled':
-            self.ride.seats_available += self.seats
-            self.ride.save()
\ No newline at end of file
+        self._original_status = self.status
+
+
+class EarningsEntry(models.Model):
+    """
+    Append-only ledger of driver earnings. Accepting a booking credits the
+    driver with its seats at the ride's price at that moment; cancelling it
+    adds a reversal of that credit. A booking accepted again after being
+    cancelled gets a new credit, so it holds one more credit than reversals
+    while accepted (see apps.bookings.earnings). Rows are never updated, and
+    the sum of a driver's entries is kept in User.total_earnings.
+    """
+    
+    KIND_CHOICES = [
+        ('credit', 'Credit'),
+        ('reversal', 'Reversal'),
+    ]
+    
+    driver = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='earnings_entries'
+    )
+    booking = models.ForeignKey(
+        Booking,
+        on_delete=models.SET_NULL,
+        related_name='earnings_entries',
+        null=True,
+        blank=True
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    seats = models.IntegerField()
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = 'Earnings entries'
+        indexes = [
+            models.Index(fields=['driver', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} {self.amount} for driver {self.driver_id}"
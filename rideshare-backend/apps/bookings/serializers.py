@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Booking
+from .services import SeatsUnavailable
 from apps.rides.serializers import RideListSerializer
 from apps.users.serializers import UserPublicSerializer
 
@@ -56,7 +57,11 @@ class BookingCreateSerializer(serializers.ModelSerializer):
         if validated_data['ride'].instant_booking:
             validated_data['status'] = 'accepted'
         
-        return super().create(validated_data)
+        # Seats are re-checked atomically when an instant booking reserves them
+        try:
+            return super().create(validated_data)
+        except SeatsUnavailable:
+            raise serializers.ValidationError("This ride is sold out")
 
 
 class BookingSerializer(serializers.ModelSerializer):
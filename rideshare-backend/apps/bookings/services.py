@@ -0,0 +1,115 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Least
+from django.utils import timezone
+from apps.rides.cache import invalidate_ride
+from apps.rides.models import Ride
+
+
+class SeatsUnavailable(Exception):
+    """Raised when a ride no longer has enough free seats for a booking"""
+
+
+class BookingConflict(Exception):
+    """Raised when a booking's status changed since it was loaded"""
+
+
+def reserve_seats(ride, seats):
+    """
+    Take seats from a ride with one conditional UPDATE.
+    Raises SeatsUnavailable instead of overselling when the ride is full.
+    """
+    reserved = Ride.objects.filter(
+        pk=ride.pk,
+        seats_available__gte=seats
+    ).update(seats_available=F('seats_available') - seats)
+    
+    if not reserved:
+        raise SeatsUnavailable(f"Ride {ride.pk} has fewer than {seats} seats left")
+    
+    _seats_changed(ride)
+
+
+def release_seats(ride, seats):
+    """Give seats back to a ride, never exceeding its total seats"""
+    Ride.objects.filter(pk=ride.pk).update(
+        seats_available=Least(F('seats_available') + seats, F('total_seats'))
+    )
+    _seats_changed(ride)
+
+
+def cancel_ride(ride):
+    """
+    Cancel a ride and fan out to its passengers with a fixed number of
+    queries: every pending/accepted booking is cancelled with one UPDATE,
+    accepted seats are released and their earnings reversed, and each
+    passenger gets a ride_cancelled notification through one bulk INSERT. Returns the number of bookings
+    cancelled (0 if the ride was already cancelled).
+    """
+    from apps.bookings.earnings import reverse_bookings
+    from apps.bookings.models import Booking
+    from apps.notifications.counters import count_created
+    from apps.notifications.events import publish_notifications
+    from apps.notifications.models import Notification
+    from apps.users import stats
+    
+    with transaction.atomic():
+        locked = Ride.objects.select_for_update().filter(pk=ride.pk).exclude(
+            status='cancelled'
+        ).values_list('id', flat=True).first()
+        if locked is None:
+            return 0
+        
+        bookings = list(
+            Booking.objects.select_for_update().filter(
+                ride_id=ride.pk,
+                status__in=['pending', 'accepted']
+            ).values_list('id', 'passenger_id', 'status', 'seats')
+        )
+        
+        if bookings:
+            Booking.objects.filter(
+                id__in=[booking_id for booking_id, _, _, _ in bookings]
+            ).update(status='cancelled', updated_at=timezone.now())
+        
+        accepted_seats = sum(
+            seats for _, _, status, seats in bookings if status == 'accepted'
+        )
+        if accepted_seats:
+            release_seats(ride, accepted_seats)
+            reverse_bookings([
+                booking_id for booking_id, _, status, _ in bookings
+                if status == 'accepted'
+            ])
+        
+        # Passengers of a completed ride stop counting it as taken
+        stats.bookings_changed(ride.pk, [
+            passenger_id for _, passenger_id, status, _ in bookings
+            if status == 'accepted'
+        ], -1)
+        
+        ride.status = 'cancelled'
+        ride.save(update_fields=['status', 'updated_at'])
+        
+        notifications = Notification.objects.bulk_create([
+            Notification(
+                recipient_id=passenger_id,
+                sender=ride.driver,
+                notification_type='ride_cancelled',
+                title='Ride Cancelled',
+                message=f'Your ride from {ride.origin} to {ride.destination} was cancelled by the driver.',
+                ride_id=ride.pk,
+                booking_id=booking_id
+            )
+            for booking_id, passenger_id, _, _ in bookings
+        ])
+        count_created(notifications)
+        publish_notifications(notifications)
+    
+    return len(bookings)
+
+
+def _seats_changed(ride):
+    """Reload the seat count on the instance and drop cached searches showing it"""
+    ride.refresh_from_db(fields=['seats_available'])
+    invalidate_ride(ride)
@@ -1,3 +1,40 @@
+from datetime import timedelta
+from decimal import Decimal
 from django.test import TestCase
+from django.utils import timezone
+from apps.rides.models import Ride
+from apps.users.models import User
+from .models import Booking, EarningsEntry
 
-# Create your tests here.
+
+class EarningsLedgerTests(TestCase):
+    """Booking status transitions keep the earnings ledger balanced"""
+
+    def setUp(self):
+        self.driver = User.objects.create_user(email='driver@example.com', username='driver', password='pw')
+        passenger = User.objects.create_user(email='passenger@example.com', username='passenger', password='pw')
+        ride = Ride.objects.create(
+            driver=self.driver, origin='Boston', destination='New York',
+            departure_time=timezone.now() + timedelta(days=2),
+            price=20, seats_available=3, total_seats=3
+        )
+        self.booking = Booking.objects.create(ride=ride, passenger=passenger, seats=2)
+
+    def set_status(self, status):
+        self.booking.status = status
+        self.booking.save()
+
+    def test_booking_accepted_again_after_cancellation_is_credited_again(self):
+        for status in ['accepted', 'cancelled', 'accepted']:
+            self.set_status(status)
+
+        entries = EarningsEntry.objects.filter(booking=self.booking)
+        self.assertEqual(entries.filter(kind='credit').count(), 2)
+        self.assertEqual(entries.filter(kind='reversal').count(), 1)
+        self.driver.refresh_from_db()
+        self.assertEqual(self.driver.total_earnings, Decimal('40'))
+
+        self.set_status('cancelled')
+        self.driver.refresh_from_db()
+        self.assertEqual(self.driver.total_earnings, Decimal('0'))
+        self.assertEqual(entries.filter(kind='reversal').count(), 2)
@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
 from django.shortcuts import get_object_or_404
 from .models import Booking
+from .services import BookingConflict, SeatsUnavailable
 from .serializers import (
     BookingCreateSerializer,
     BookingSerializer,
@@ -45,9 +46,11 @@ class BookingListView(generics.ListAPIView):
     """
     GET /api/bookings/ - List user's bookings
     Query params: ?status=pending&as=passenger (or driver)
+    &pagination=cursor for keyset pages
     """
     serializer_class = BookingSerializer
     permission_classes = [permissions.IsAuthenticated]
+    keyset_field = 'created_at'
     
     def get_queryset(self):
         user = self.request.user
@@ -93,7 +96,13 @@ class BookingDetailView(generics.RetrieveDestroyAPIView):
             )
         
         booking.status = 'cancelled'
-        booking.save()
+        try:
+            booking.save()
+        except BookingConflict:
+            return Response(
+                {'error': 'Booking was updated by another request'},
+                status=status.HTTP_409_CONFLICT
+            )
         
         return Response(
             {'message': 'Booking cancelled successfully'},
@@ -120,15 +129,20 @@ def accept_booking(request, pk):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # Check if enough seats available
-    if booking.seats > booking.ride.seats_available:
+    # Seats are reserved atomically; a full ride reports sold out
+    booking.status = 'accepted'
+    try:
+        booking.save()
+    except SeatsUnavailable:
         return Response(
-            {'error': 'Not enough seats available'},
-            status=status.HTTP_400_BAD_REQUEST
+            {'error': 'Not enough seats available', 'code': 'sold_out'},
+            status=status.HTTP_409_CONFLICT
+        )
+    except BookingConflict:
+        return Response(
+            {'error': 'Booking was updated by another request'},
+            status=status.HTTP_409_CONFLICT
         )
-    
-    booking.status = 'accepted'
-    booking.save()
     
     return Response(
         BookingSerializer(booking).data,
@@ -156,7 +170,13 @@ def decline_booking(request, pk):
         )
     
     booking.status = 'declined'
-    booking.save()
+    try:
+        booking.save()
+    except BookingConflict:
+        return Response(
+            {'error': 'Booking was updated by another request'},
+            status=status.HTTP_409_CONFLICT
+        )
     
     return Response(
         BookingSerializer(booking).data,
@@ -0,0 +1,171 @@
+"""
+Upload pipeline for user images (avatars, car photos).
+
+After an upload is saved, a worker thread re-encodes the original without
+its metadata (EXIF, GPS, comments) and writes one WebP thumbnail per size
+in IMAGE_THUMBNAIL_SIZES under THUMBNAIL_DIR:
+
+    avatars/me.jpg -> thumbnails/avatars/me.jpg_64.webp, ...
+
+Thumbnail names are derived from the original's full name, so serializers
+can link them without a lookup (see apps.core.serializers.ThumbnailsField).
+Keeping the extension and a directory no upload goes to makes them as
+unique as the originals: me.jpg and me.png never share a thumbnail.
+"""
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_DIR = 'thumbnails'
+THUMBNAIL_FORMAT = 'WEBP'
+THUMBNAIL_EXTENSION = '.webp'
+THUMBNAIL_QUALITY = 80
+
+# Formats of originals that are re-encoded to drop metadata
+REENCODE_OPTIONS = {
+    'JPEG': {'quality': 90, 'optimize': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': 90},
+}
+
+_executor = None
+
+
+def thumbnail_sizes():
+    return tuple(settings.IMAGE_THUMBNAIL_SIZES)
+
+
+def thumbnail_name(name, size):
+    """Storage name of the size px thumbnail of the image stored as name"""
+    return f'{THUMBNAIL_DIR}/{name}_{size}{THUMBNAIL_EXTENSION}'
+
+
+def thumbnail_urls(image):
+    """{size: url} of a stored image's thumbnails"""
+    return {
+        size: image.storage.url(thumbnail_name(image.name, size))
+        for size in thumbnail_sizes()
+    }
+
+
+def get_executor():
+    """Worker threads shared by the process; Pillow releases the GIL while resizing"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_PROCESSING_WORKERS,
+            thread_name_prefix='images'
+        )
+    return _executor
+
+
+def pending_uploads(instance, field_names):
+    """Image fields holding a new upload; call before the instance is saved"""
+    pending = []
+    for field_name in field_names:
+        image = getattr(instance, field_name)
+        if image and not image._committed:
+            pending.append(field_name)
+    return pending
+
+
+def schedule(image, crop):
+    """Process a saved image in the pool once the transaction commits"""
+    storage, name = image.storage, image.name
+    transaction.on_commit(
+        lambda: get_executor().submit(_run, storage, name, crop)
+    )
+
+
+def _run(storage, name, crop):
+    try:
+        process_image(storage, name, crop)
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+        logger.exception('Could not process image %s', name)
+
+
+def process_image(storage, name, crop):
+    """
+    Strip the stored image's metadata and write its thumbnails.
+    With crop, thumbnails are size x size squares (avatars); otherwise the
+    whole image is scaled to fit within size x size.
+    """
+    with storage.open(name) as source:
+        image = Image.open(source)
+        image.load()
+    original_format = image.format
+    has_metadata = bool(image.getexif()) or any(
+        key in image.info for key in ('exif', 'xmp', 'comment')
+    )
+
+    # Apply the EXIF orientation, then drop everything but the color profile
+    image = ImageOps.exif_transpose(image)
+    image.info = {
+        key: value for key, value in image.info.items() if key == 'icc_profile'
+    }
+
+    if has_metadata and original_format in REENCODE_OPTIONS:
+        _replace(storage, name, _encode(image, original_format, REENCODE_OPTIONS[original_format]))
+
+    mode = 'RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB'
+    image = image.convert(mode)
+    for size in thumbnail_sizes():
+        if crop:
+            thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        else:
+            thumbnail = image.copy()
+            thumbnail.thumbnail((size, size), Image.Resampling.LANCZOS)
+        _replace(storage, thumbnail_name(name, size), _encode(
+            thumbnail, THUMBNAIL_FORMAT, {'quality': THUMBNAIL_QUALITY, 'method': 4}
+        ))
+
+
+def _encode(image, image_format, options):
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    if 'icc_profile' in image.info:
+        options = {**options, 'icc_profile': image.info['icc_profile']}
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def _replace(storage, name, content):
+    """
+    Overwrite a stored file, keeping its name, without a moment where it is
+    missing: on the local filesystem the new content is written to a
+    temporary file and renamed over the old one; remote storages that
+    overwrite in place (file_overwrite, e.g. S3) write it directly.
+    """
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        path = None
+    
+    if path is not None:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(content)
+            os.chmod(temporary, storage.file_permissions_mode or 0o644)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        return
+    
+    if not getattr(storage, 'file_overwrite', False):
+        storage.delete(name)
+    saved = storage.save(name, ContentFile(content))
+    if saved != name:
+        logger.warning('Image %s was stored as %s', name, saved)
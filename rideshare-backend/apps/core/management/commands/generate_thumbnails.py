@@ -0,0 +1,45 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from django.core.management.base import BaseCommand
+from apps.core.images import process_image
+from apps.rides.models import Car
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Strip metadata from, and write thumbnails of, the avatars and car photos
+    already stored (uploads from now on are processed as they are saved)
+    
+    Usage: python manage.py generate_thumbnails [--workers 4]
+    """
+    help = 'Process stored avatars and car photos into thumbnails'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+
+    def handle(self, *args, **options):
+        sources = [
+            (User, 'avatar', True),
+            (Car, 'car_image', False),
+        ]
+        jobs = []
+        for model, field_name, crop in sources:
+            storage = model._meta.get_field(field_name).storage
+            names = model.objects.exclude(**{field_name: ''}).exclude(
+                **{f'{field_name}__isnull': True}
+            ).values_list(field_name, flat=True).iterator()
+            jobs.extend((storage, name, crop) for name in names)
+        
+        failed = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            futures = {executor.submit(process_image, *job): job[1] for job in jobs}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f'{futures[future]}: {exc}')
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {len(jobs) - failed} images ({failed} failed)'
+        ))
@@ -0,0 +1,186 @@
+import base64
+import json
+from collections import OrderedDict
+from functools import reduce
+from django.core.exceptions import ValidationError
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset (cursor) mode.
+    
+    Views opt in by setting ``keyset_field`` (e.g. 'departure_time', or a
+    related field such as 'ride__departure_time'); rows are then ordered by
+    (keyset_field, id) in the direction of the queryset's ordering. Clients
+    start with ``?pagination=cursor`` (implied when the view sets
+    ``keyset_default = True``) and follow the opaque ``next``/``previous``
+    links, which carry ``?cursor=<token>``. Keyset pages skip the COUNT query and seek
+    straight to the position, so every page costs the same.
+    
+    When the active ordering isn't on the keyset field (e.g.
+    ?ordering=price) the regular page-number pagination is used.
+    """
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_field = getattr(view, 'keyset_field', None)
+        self.use_keyset = bool(self.keyset_field) and (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == 'cursor'
+            or getattr(view, 'keyset_default', False)
+        )
+        if self.use_keyset:
+            self.descending = self._keyset_direction(queryset)
+            self.use_keyset = self.descending is not None
+        
+        if not self.use_keyset:
+            return super().paginate_queryset(queryset, request, view)
+        
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        
+        self.request = request
+        position = self._decode_cursor(
+            request.query_params.get(self.cursor_query_param),
+            self._keyset_model_field(queryset.model)
+        )
+        backwards = bool(position and position['r'])
+        
+        # Walking backwards flips the sort, then the page is reversed
+        descending = self.descending != backwards
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(f'{prefix}{self.keyset_field}', f'{prefix}id')
+        
+        if position:
+            lookup = 'lt' if descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.keyset_field}__{lookup}': position['v']})
+                | Q(**{self.keyset_field: position['v'], f'id__{lookup}': position['id']})
+            )
+        
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+        
+        self.next_position = self.previous_position = None
+        if rows:
+            if backwards:
+                # We came from a later page; earlier rows remain if has_more
+                self.next_position = self._position(rows[-1], reverse=False)
+                if has_more:
+                    self.previous_position = self._position(rows[0], reverse=True)
+            else:
+                if has_more:
+                    self.next_position = self._position(rows[-1], reverse=False)
+                if position:
+                    self.previous_position = self._position(rows[0], reverse=True)
+        
+        return rows
+
+    def get_paginated_response(self, data):
+        if not self.use_keyset:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        if not getattr(self, 'use_keyset', False):
+            return super().get_paginated_response_schema(schema)
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.use_keyset:
+            return super().get_next_link()
+        return self._link(self.next_position)
+
+    def get_previous_link(self):
+        if not self.use_keyset:
+            return super().get_previous_link()
+        return self._link(self.previous_position)
+
+    def _keyset_direction(self, queryset):
+        """True/False for descending/ascending, None if not ordered by the keyset field"""
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        if not ordering:
+            return None
+        first = ordering[0]
+        if not isinstance(first, str) or first.lstrip('-') != self.keyset_field:
+            return None
+        return first.startswith('-')
+
+    def _keyset_model_field(self, model):
+        """Model field behind keyset_field, following relations"""
+        *relations, name = self.keyset_field.split(LOOKUP_SEP)
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        return model._meta.get_field(name)
+
+    def _position(self, row, reverse):
+        # Rows are model instances, or dicts from a values() queryset
+        if isinstance(row, dict):
+            value, pk = row[self.keyset_field], row['id']
+        else:
+            value = reduce(getattr, self.keyset_field.split(LOOKUP_SEP), row)
+            pk = row.pk
+        return {
+            'v': value.isoformat() if hasattr(value, 'isoformat') else value,
+            'id': pk,
+            'r': int(reverse),
+        }
+
+    def _link(self, position):
+        if position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        token = base64.urlsafe_b64encode(
+            json.dumps(position, separators=(',', ':')).encode()
+        ).decode().rstrip('=')
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def _decode_cursor(self, token, field):
+        """
+        Position from a cursor token, with its value converted by the keyset
+        model field. Any malformed token is a 404, never a server error.
+        """
+        if not token:
+            return None
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if not isinstance(position, dict) or not {'v', 'id', 'r'} <= position.keys():
+                raise ValueError
+            # Positions only ever hold isoformat strings or numbers
+            value, pk = position['v'], position['id']
+            if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+                raise ValueError
+            if isinstance(pk, bool) or not isinstance(pk, int) or not 0 <= pk < 2 ** 63:
+                raise ValueError
+            position['v'] = field.to_python(value)
+            if position['v'] is None:
+                raise ValueError
+        except (ValidationError, TypeError, ValueError, OverflowError):
+            raise NotFound(self.invalid_cursor_message)
+        return position
@@ -0,0 +1,19 @@
+from rest_framework import serializers
+from .images import thumbnail_urls
+
+
+class ThumbnailsField(serializers.ReadOnlyField):
+    """
+    {"64": url, "128": url, ...} of an image field's thumbnails (see
+    apps.core.images), absolute when a request is in the context; None
+    without an image
+    """
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        request = self.context.get('request')
+        return {
+            str(size): request.build_absolute_uri(url) if request is not None else url
+            for size, url in thumbnail_urls(value).items()
+        }
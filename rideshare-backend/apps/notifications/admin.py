@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Notification
+from .models import Notification, NotificationArchive, NotificationOutbox
 
 
 @admin.register(Notification)
@@ -29,3 +29,17 @@ class NotificationAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at')
         }),
     )
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ('id', 'event', 'booking', 'created_at')
+    list_filter = ('event',)
+    readonly_fields = ('created_at',)
+
+
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(admin.ModelAdmin):
+    list_display = ('id', 'recipient', 'notification_type', 'title', 'created_at')
+    list_filter = ('notification_type',)
+    search_fields = ('recipient__email', 'title')
@@ -0,0 +1,44 @@
+from collections import Counter
+from django.contrib.auth import get_user_model
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Greatest
+
+
+def add_unread(deltas):
+    """
+    Apply {user_id: delta} to the stored unread notification counters in a
+    single UPDATE, never going below zero
+    """
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    
+    delta = Case(
+        *[When(pk=user_id, then=Value(value)) for user_id, value in deltas.items()],
+        default=Value(0),
+        output_field=IntegerField()
+    )
+    get_user_model().objects.filter(pk__in=deltas).update(
+        unread_notifications=Greatest(F('unread_notifications') + delta, Value(0))
+    )
+
+
+def count_created(notifications):
+    """Count freshly created (e.g. bulk-created) unread notifications"""
+    add_unread(Counter(
+        notification.recipient_id
+        for notification in notifications
+        if not notification.is_read
+    ))
+
+
+def unread_counts(user_ids):
+    """{user_id: unread count} from the stored counters"""
+    return dict(
+        get_user_model().objects.filter(pk__in=user_ids)
+        .values_list('id', 'unread_notifications')
+    )
+
+
+def unread_count(user_id):
+    return unread_counts([user_id]).get(user_id, 0)
@@ -0,0 +1,226 @@
+"""
+Push channel for notification events, consumed by the SSE stream view.
+
+Each process keeps an in-process broker of per-user subscriber queues.
+Events are published through a transport that reaches every process
+(including this one), whose listener thread hands them to the broker:
+
+- 'postgres': NOTIFY/LISTEN on the default database; a NOTIFY sent in a
+  transaction is delivered on commit
+- 'socket': UDP datagrams between processes on this host, each listener
+  registering its port in NOTIFICATION_EVENTS_SOCKET_DIR
+- 'local': this process only (single-process servers and tests)
+"""
+import asyncio
+import json
+import logging
+import os
+import select
+import socket
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from django.conf import settings
+from django.db import connection, connections, transaction
+from .counters import unread_counts
+from .serializers import NotificationListSerializer
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'notification_events'
+
+# Events waiting for a slow client before the oldest are dropped
+QUEUE_SIZE = 100
+
+
+class Broker:
+    """Per-user asyncio queues of the clients connected to this process"""
+
+    def __init__(self):
+        self._subscribers = defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        """Queue receiving this user's events; call from the event loop"""
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[user_id][queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, user_id, queue):
+        with self._lock:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.pop(queue, None)
+                if not queues:
+                    del self._subscribers[user_id]
+
+    def deliver(self, user_id, event):
+        """Hand an event to the user's queues; safe from any thread"""
+        with self._lock:
+            targets = list(self._subscribers.get(user_id, {}).items())
+        for queue, loop in targets:
+            loop.call_soon_threadsafe(self._put, queue, event)
+
+    @staticmethod
+    def _put(queue, event):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+
+broker = Broker()
+
+
+def _dispatch(payload):
+    """Listener callback: route a raw payload to the local broker"""
+    try:
+        message = json.loads(payload)
+        broker.deliver(message['user'], {'event': message['event'], 'data': message['data']})
+    except (ValueError, KeyError, TypeError):
+        logger.warning('Dropped malformed notification event')
+
+
+class LocalTransport:
+    def send(self, payload):
+        _dispatch(payload)
+
+    def listen(self):
+        pass
+
+
+class PostgresTransport:
+    def send(self, payload):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [CHANNEL, payload])
+
+    def listen(self):
+        """Blocking LISTEN loop with its own connection; reconnects on errors"""
+        while True:
+            db = connections.create_connection('default')
+            try:
+                db.ensure_connection()
+                with db.cursor() as cursor:
+                    cursor.execute(f'LISTEN {CHANNEL}')
+                raw = db.connection
+                while True:
+                    if select.select([raw], [], [], 60) == ([], [], []):
+                        continue
+                    raw.poll()
+                    while raw.notifies:
+                        _dispatch(raw.notifies.pop(0).payload)
+            except Exception:
+                logger.exception('Notification listener lost its connection')
+                time.sleep(5)
+            finally:
+                db.close()
+
+
+class SocketTransport:
+    def __init__(self):
+        self.directory = Path(getattr(
+            settings, 'NOTIFICATION_EVENTS_SOCKET_DIR',
+            Path(tempfile.gettempdir()) / 'rideshare-notification-events'
+        ))
+
+    def send(self, payload):
+        data = payload.encode()
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            for entry in self.directory.glob('*.port'):
+                try:
+                    sock.sendto(data, ('127.0.0.1', int(entry.stem)))
+                except (OSError, ValueError):
+                    continue
+
+    def listen(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.bind(('127.0.0.1', 0))
+            registration = self.directory / f'{sock.getsockname()[1]}.port'
+            registration.write_text(str(os.getpid()))
+            try:
+                while True:
+                    _dispatch(sock.recv(65535).decode())
+            finally:
+                registration.unlink(missing_ok=True)
+
+
+TRANSPORTS = {
+    'local': LocalTransport,
+    'postgres': PostgresTransport,
+    'socket': SocketTransport,
+}
+
+_transport = None
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def get_transport():
+    global _transport
+    if _transport is None:
+        name = getattr(settings, 'NOTIFICATION_EVENTS_TRANSPORT', 'postgres')
+        _transport = TRANSPORTS[name]()
+    return _transport
+
+
+def start_listener():
+    """Start this process's listener thread once (in ASGI servers)"""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = threading.Thread(
+                target=get_transport().listen,
+                name='notification-events',
+                daemon=True
+            )
+            _listener.start()
+
+
+def publish(user_id, event, data):
+    """
+    Send an event to every connected client of the user, once committed.
+    Delivery is best effort: a failed send is logged, never raised.
+    """
+    payload = json.dumps({'user': user_id, 'event': event, 'data': data}, default=str)
+    transaction.on_commit(lambda: get_transport().send(payload), robust=True)
+
+
+def absolute_urls(data, build_absolute_uri):
+    """
+    A published notification with its media URLs made absolute, as
+    serializers do with a request in their context
+    """
+    data = dict(data)
+    if data.get('sender_avatar'):
+        data['sender_avatar'] = build_absolute_uri(data['sender_avatar'])
+    if data.get('sender_avatar_thumbnails'):
+        data['sender_avatar_thumbnails'] = {
+            size: build_absolute_uri(url)
+            for size, url in data['sender_avatar_thumbnails'].items()
+        }
+    return data
+
+
+def publish_notifications(notifications):
+    """
+    Push newly created notifications, then their recipients' unread counts.
+    Media URLs are relative here; the stream makes them absolute per client.
+    """
+    for notification in notifications:
+        publish(
+            notification.recipient_id, 'notification',
+            NotificationListSerializer(notification).data
+        )
+    publish_unread_counts({notification.recipient_id for notification in notifications})
+
+
+def publish_unread_counts(user_ids):
+    """Push the current unread count of each user"""
+    if not user_ids:
+        return
+    counts = unread_counts(user_ids)
+    for user_id in user_ids:
+        publish(user_id, 'unread_count', {'count': counts.get(user_id, 0)})
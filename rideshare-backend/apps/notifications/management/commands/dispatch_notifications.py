@@ -0,0 +1,84 @@
+import threading
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection
+from apps.notifications.outbox import dispatch_batch, dispatch_digests
+
+
+class Command(BaseCommand):
+    """
+    Drain the notification outbox into Notification rows
+    
+    Usage: python manage.py dispatch_notifications [--workers 4] [--batch-size 100] [--once]
+           python manage.py dispatch_notifications --digest  (periodically, e.g. hourly)
+    
+    Workers claim entries with SELECT ... FOR UPDATE SKIP LOCKED, so
+    several threads (or several processes running this command) share
+    the outbox without handling an entry twice.
+    """
+    help = 'Create notifications from queued booking events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1)
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Seconds to wait when the outbox is empty'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the outbox is empty instead of polling'
+        )
+        parser.add_argument(
+            '--digest',
+            action='store_true',
+            help='Deliver held NOTIFICATION_DIGEST_TYPES events as digests, then exit'
+        )
+
+    def handle(self, *args, **options):
+        if options['digest']:
+            count = 0
+            while batch := dispatch_digests():
+                count += batch
+            self.stdout.write(self.style.SUCCESS(f'Delivered {count} events as digests'))
+            return
+        
+        self.dispatched = 0
+        self.lock = threading.Lock()
+        
+        workers = max(1, options['workers'])
+        if workers > 1 and not connection.features.has_select_for_update_skip_locked:
+            self.stderr.write('This database cannot skip locked rows; using a single worker')
+            workers = 1
+        
+        threads = [
+            threading.Thread(target=self._work, args=(options,), daemon=True)
+            for _ in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=1)
+        except KeyboardInterrupt:
+            pass
+        
+        self.stdout.write(self.style.SUCCESS(f'Dispatched {self.dispatched} notification events'))
+
+    def _work(self, options):
+        try:
+            while True:
+                count = dispatch_batch(options['batch_size'])
+                with self.lock:
+                    self.dispatched += count
+                if count:
+                    continue
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
+        finally:
+            connection.close()
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from apps.notifications import retention
+
+
+class Command(BaseCommand):
+    """
+    Postgres only: range-partition the notifications table by month
+    
+    Usage: python manage.py partition_notifications --convert   (once; locks the table)
+           python manage.py partition_notifications [--months-ahead 3]   (monthly)
+    """
+    help = 'Convert notifications to monthly partitions and create upcoming ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--convert',
+            action='store_true',
+            help='Convert the existing table into a partitioned one'
+        )
+        parser.add_argument('--months-ahead', type=int, default=3)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Partitioning requires PostgreSQL')
+        
+        if retention.is_partitioned():
+            retention.ensure_partitions(options['months_ahead'])
+        elif options['convert']:
+            retention.convert_to_partitioned(options['months_ahead'])
+        else:
+            raise CommandError('The notifications table is not partitioned; run with --convert')
+        
+        count = len(retention.monthly_partitions())
+        self.stdout.write(self.style.SUCCESS(f'Notifications table has {count} monthly partitions'))
@@ -0,0 +1,52 @@
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.notifications import retention
+
+
+class Command(BaseCommand):
+    """
+    Move read notifications older than NOTIFICATION_RETENTION_DAYS into
+    the archive table (or delete them), in small batches
+    
+    Usage: python manage.py prune_notifications [--days 90] [--delete] [--batch-size 1000]
+    
+    On a partitioned table (see partition_notifications) expired months
+    that hold only read notifications are dropped whole first.
+    """
+    help = 'Archive or delete old read notifications'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None)
+        parser.add_argument(
+            '--delete',
+            action='store_true',
+            help='Drop old notifications instead of archiving them'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.1,
+            help='Seconds to sleep between batches'
+        )
+
+    def handle(self, *args, **options):
+        days = options['days'] or settings.NOTIFICATION_RETENTION_DAYS
+        archive = settings.NOTIFICATION_ARCHIVE and not options['delete']
+        cutoff = timezone.now() - timedelta(days=days)
+        
+        removed = 0
+        if retention.is_partitioned():
+            removed += retention.drop_expired_partitions(cutoff, archive)
+        
+        while batch := retention.prune_batch(cutoff, options['batch_size'], archive):
+            removed += batch
+            time.sleep(options['pause'])
+        
+        action = 'Archived' if archive else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} {removed} read notifications older than {days} days'
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from apps.notifications.models import Notification
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Reset the stored unread notification counters on User to the actual
+    number of unread notifications, where they have drifted
+    
+    Usage: python manage.py reconcile_unread_counts (e.g. hourly from cron)
+    """
+    help = 'Fix drift in the per-user unread notification counters'
+
+    def handle(self, *args, **options):
+        unread = Notification.objects.filter(
+            recipient=OuterRef('pk'),
+            is_read=False
+        ).order_by().values('recipient').annotate(total=Count('id')).values('total')
+        actual = Coalesce(Subquery(unread, output_field=IntegerField()), 0)
+        
+        fixed = User.objects.alias(actual=actual).exclude(
+            unread_notifications=F('actual')
+        ).update(unread_notifications=actual)
+        
+        self.stdout.write(self.style.SUCCESS(f'Fixed unread counters for {fixed} users'))
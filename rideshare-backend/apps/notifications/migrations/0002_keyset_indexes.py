@@ -0,0 +1,21 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_keyset_indexes'),
+        ('notifications', '0001_initial'),
+        ('rides', '0004_ride_coordinates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'created_at'], name='notificatio_recipie_f39341_idx'),
+        ),
+    ]
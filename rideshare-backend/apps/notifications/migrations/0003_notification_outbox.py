@@ -0,0 +1,27 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_keyset_indexes'),
+        ('notifications', '0002_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.CharField(choices=[('ride_request', 'Ride Request'), ('request_accepted', 'Request Accepted'), ('request_declined', 'Request Declined'), ('ride_cancelled', 'Ride Cancelled'), ('booking_cancelled', 'Booking Cancelled')], max_length=30)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='bookings.booking')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_notification_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='actors',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('ride_request', 'Ride Request'), ('request_accepted', 'Request Accepted'), ('request_declined', 'Request Declined'), ('ride_cancelled', 'Ride Cancelled'), ('booking_cancelled', 'Booking Cancelled'), ('digest', 'Digest')], max_length=30),
+        ),
+        migrations.AlterField(
+            model_name='notificationoutbox',
+            name='event',
+            field=models.CharField(choices=[('ride_request', 'Ride Request'), ('request_accepted', 'Request Accepted'), ('request_declined', 'Request Declined'), ('ride_cancelled', 'Ride Cancelled'), ('booking_cancelled', 'Booking Cancelled'), ('digest', 'Digest')], max_length=30),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0004_notification_coalescing'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('sender_id', models.BigIntegerField(blank=True, null=True)),
+                ('notification_type', models.CharField(choices=[('ride_request', 'Ride Request'), ('request_accepted', 'Request Accepted'), ('request_declined', 'Request Declined'), ('ride_cancelled', 'Ride Cancelled'), ('booking_cancelled', 'Booking Cancelled'), ('digest', 'Digest')], max_length=30)),
+                ('title', models.CharField(max_length=255)),
+                ('message', models.TextField()),
+                ('count', models.PositiveIntegerField(default=1)),
+                ('ride_id', models.BigIntegerField(blank=True, null=True)),
+                ('booking_id', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+                ('recipient', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['recipient', 'created_at'], name='notificatio_recipie_7cae9b_idx')],
+            },
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from apps.core.models import TimeStampedModel
 from apps.rides.models import Ride
@@ -16,6 +16,7 @@ class Notification(TimeStampedModel):
         ('request_declined', 'Request Declined'),
         ('ride_cancelled', 'Ride Cancelled'),
         ('booking_cancelled', 'Booking Cancelled'),
+        ('digest', 'Digest'),
     ]
     
     recipient = models.ForeignKey(
@@ -37,6 +38,11 @@ class Notification(TimeStampedModel):
     title = models.CharField(max_length=255)
     message = models.TextField()
     
+    # Events merged into this notification (coalescing and digests),
+    # with the latest actors as [{'id', 'name'}]
+    count = models.PositiveIntegerField(default=1)
+    actors = models.JSONField(default=list, blank=True)
+    
     # Related objects
     ride = models.ForeignKey(
         Ride,
@@ -61,15 +67,85 @@ class Notification(TimeStampedModel):
             models.Index(fields=['recipient', 'is_read']),
             models.Index(fields=['notification_type']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['recipient', 'created_at']),
         ]
     
     def __str__(self):
         return f"{self.notification_type} for {self.recipient.email}"
     
     def mark_as_read(self):
-        """Mark notification as read"""
+        """Mark notification as read and decrement the recipient's unread counter"""
         if not self.is_read:
             from django.utils import timezone
+            from .counters import add_unread
+            now = timezone.now()
+            with transaction.atomic():
+                # Conditional update: concurrent calls decrement only once
+                updated = Notification.objects.filter(pk=self.pk, is_read=False).update(
+                    is_read=True, read_at=now, updated_at=now
+                )
+                if updated:
+                    add_unread({self.recipient_id: -1})
             self.is_read = True
-            self.read_at = timezone.now()
-            self.save()
+            self.read_at = self.updated_at = now
+
+
+class NotificationOutbox(models.Model):
+    """
+    Pending booking event, written in the booking's transaction and turned
+    into a Notification by the dispatch_notifications worker
+    """
+    
+    event = models.CharField(
+        max_length=30,
+        choices=Notification.NOTIFICATION_TYPES
+    )
+    booking = models.ForeignKey(
+        Booking,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['id']
+    
+    def __str__(self):
+        return f"{self.event} for booking {self.booking_id}"
+
+
+class NotificationArchive(models.Model):
+    """
+    Compact copy of a read notification moved out of the live table by
+    prune_notifications (same id as the original). Related rows are kept
+    as plain ids so archived rows never block or cascade other deletes.
+    """
+    
+    id = models.BigIntegerField(primary_key=True)
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+',
+        db_index=False
+    )
+    sender_id = models.BigIntegerField(null=True, blank=True)
+    notification_type = models.CharField(
+        max_length=30,
+        choices=Notification.NOTIFICATION_TYPES
+    )
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    count = models.PositiveIntegerField(default=1)
+    ride_id = models.BigIntegerField(null=True, blank=True)
+    booking_id = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    read_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.notification_type} for user {self.recipient_id} (archived)"
@@ -0,0 +1,260 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from apps.bookings.models import Booking
+from .counters import count_created
+from .events import publish_notifications
+from .models import Notification, NotificationOutbox
+
+
+def _ride_request(booking):
+    ride = booking.ride
+    return (
+        ride.driver, booking.passenger, 'New Ride Request',
+        f'{booking.passenger.full_name} requested {booking.seats} seat(s) for your ride from {ride.origin} to {ride.destination}.'
+    )
+
+
+def _request_accepted(booking):
+    ride = booking.ride
+    return (
+        booking.passenger, ride.driver, 'Ride Request Accepted',
+        f'Your ride request for {ride.origin} to {ride.destination} has been accepted!'
+    )
+
+
+def _request_declined(booking):
+    ride = booking.ride
+    return (
+        booking.passenger, ride.driver, 'Ride Request Declined',
+        f'Your ride request for {ride.origin} to {ride.destination} was declined.'
+    )
+
+
+def _booking_cancelled(booking):
+    ride = booking.ride
+    return (
+        ride.driver, booking.passenger, 'Booking Cancelled',
+        f'{booking.passenger.full_name} cancelled their booking for your ride from {ride.origin} to {ride.destination}.'
+    )
+
+
+def _ride_requests(notification):
+    ride = notification.booking.ride
+    return (
+        'New Ride Requests',
+        f'{_actor_names(notification)} requested seats for your ride from {ride.origin} to {ride.destination}.'
+    )
+
+
+# event -> booking -> (recipient, sender, title, message)
+BUILDERS = {
+    'ride_request': _ride_request,
+    'request_accepted': _request_accepted,
+    'request_declined': _request_declined,
+    'booking_cancelled': _booking_cancelled,
+}
+
+# Coalescible events: merged notification -> (title, message)
+MERGED_BUILDERS = {
+    'ride_request': _ride_requests,
+}
+
+# Latest actors kept on a merged notification
+MAX_ACTORS = 3
+
+
+def _actor(user):
+    return {'id': user.pk, 'name': user.full_name}
+
+
+def _actor_names(notification):
+    """'Ann', 'Ann and Bob', 'Ann, Bob and 3 others'"""
+    names = [actor['name'] for actor in notification.actors]
+    others = max(notification.count - len(names), 0)
+    if others:
+        names.append(f'{others} other' + ('s' if others > 1 else ''))
+    if len(names) == 1:
+        return names[0]
+    return f"{', '.join(names[:-1])} and {names[-1]}"
+
+
+def build_notification(entry, booking):
+    """Notification for an outbox entry, or None if the event is unknown"""
+    builder = BUILDERS.get(entry.event)
+    if builder is None:
+        return None
+    recipient, sender, title, message = builder(booking)
+    return Notification(
+        recipient=recipient,
+        sender=sender,
+        notification_type=entry.event,
+        title=title,
+        message=message,
+        actors=[_actor(sender)],
+        ride_id=booking.ride_id,
+        booking=booking
+    )
+
+
+def coalesce(notifications, window):
+    """
+    Merge notifications of a coalescible type for the same recipient and
+    ride into one row, and into the latest unread row created (or last
+    merged into) for them in the last `window` seconds. Returns (new rows,
+    updated existing rows).
+    """
+    fresh, groups = [], {}
+    for notification in notifications:
+        if window and notification.notification_type in MERGED_BUILDERS:
+            key = (notification.recipient_id, notification.notification_type, notification.ride_id)
+            groups.setdefault(key, []).append(notification)
+        else:
+            fresh.append(notification)
+    if not groups:
+        return fresh, []
+    
+    # Ascending, so the latest row per key wins
+    recent = {}
+    for row in Notification.objects.select_for_update().filter(
+        recipient_id__in={key[0] for key in groups},
+        notification_type__in={key[1] for key in groups},
+        ride_id__in={key[2] for key in groups},
+        is_read=False,
+        created_at__gte=timezone.now() - timedelta(seconds=window)
+    ).order_by('created_at'):
+        recent[(row.recipient_id, row.notification_type, row.ride_id)] = row
+    
+    merged = []
+    for key, group in groups.items():
+        target = recent.get(key)
+        if target is None:
+            target, group = group[0], group[1:]
+            fresh.append(target)
+        else:
+            merged.append(target)
+        
+        for notification in group:
+            target.count += notification.count
+            target.actors = (notification.actors + [
+                actor for actor in target.actors
+                if actor not in notification.actors
+            ])[:MAX_ACTORS]
+            target.sender = notification.sender
+            target.booking = notification.booking
+        
+        if target.count > 1:
+            target.title, target.message = MERGED_BUILDERS[key[1]](target)
+    
+    return fresh, merged
+
+
+def build_digest(notifications):
+    """One 'digest' notification summarizing a recipient's notifications"""
+    if len(notifications) == 1:
+        return notifications[0]
+    actors = []
+    for notification in reversed(notifications):
+        for actor in notification.actors:
+            if actor not in actors:
+                actors.append(actor)
+    return Notification(
+        recipient_id=notifications[0].recipient_id,
+        notification_type='digest',
+        title=f'{len(notifications)} updates on your rides',
+        message='\n'.join(notification.message for notification in notifications),
+        count=len(notifications),
+        actors=actors[:MAX_ACTORS]
+    )
+
+
+def _claim(entries, batch_size):
+    """Lock up to batch_size entries, skipping those other workers hold"""
+    return list(
+        entries.select_for_update(skip_locked=True).order_by('id')[:batch_size]
+    )
+
+
+def _build(entries):
+    bookings = Booking.objects.select_related(
+        'ride__driver', 'passenger'
+    ).in_bulk({entry.booking_id for entry in entries})
+    
+    notifications = []
+    for entry in entries:
+        booking = bookings.get(entry.booking_id)
+        notification = booking and build_notification(entry, booking)
+        if notification is not None:
+            notifications.append(notification)
+    return notifications
+
+
+def _deliver(entries, notifications, merged=()):
+    """Store new and merged notifications, push them and drop the entries"""
+    now = timezone.now()
+    for notification in merged:
+        # A merged notification is news again: move it to the top of the list
+        notification.created_at = now
+        notification.updated_at = now
+    Notification.objects.bulk_create(notifications)
+    Notification.objects.bulk_update(
+        merged, ['count', 'actors', 'title', 'message', 'sender', 'booking', 'created_at', 'updated_at']
+    )
+    count_created(notifications)
+    publish_notifications([*notifications, *merged])
+    NotificationOutbox.objects.filter(
+        id__in=[entry.id for entry in entries]
+    ).delete()
+
+
+def dispatch_batch(batch_size=100):
+    """
+    Claim up to batch_size outbox entries, create their notifications and
+    delete the entries, in one transaction; connected clients are pushed
+    the new notifications on commit. Entries locked by another
+    worker are skipped (FOR UPDATE SKIP LOCKED), so workers can run in
+    parallel. Returns the number of entries processed.
+    
+    Events listed in NOTIFICATION_DIGEST_TYPES are left for
+    dispatch_digests; coalescible events are merged (see coalesce).
+    """
+    with transaction.atomic():
+        entries = _claim(
+            NotificationOutbox.objects.exclude(event__in=settings.NOTIFICATION_DIGEST_TYPES),
+            batch_size
+        )
+        if not entries:
+            return 0
+        
+        notifications, merged = coalesce(
+            _build(entries), settings.NOTIFICATION_COALESCE_WINDOW
+        )
+        _deliver(entries, notifications, merged)
+    
+    return len(entries)
+
+
+def dispatch_digests(batch_size=1000):
+    """
+    Deliver held NOTIFICATION_DIGEST_TYPES events as one digest
+    notification per recipient. Returns the number of entries processed.
+    """
+    if not settings.NOTIFICATION_DIGEST_TYPES:
+        return 0
+    
+    with transaction.atomic():
+        entries = _claim(
+            NotificationOutbox.objects.filter(event__in=settings.NOTIFICATION_DIGEST_TYPES),
+            batch_size
+        )
+        if not entries:
+            return 0
+        
+        by_recipient = {}
+        for notification in _build(entries):
+            by_recipient.setdefault(notification.recipient_id, []).append(notification)
+        
+        _deliver(entries, [build_digest(group) for group in by_recipient.values()])
+    
+    return len(entries)
@@ -0,0 +1,244 @@
+"""
+Retention for the notifications table: read notifications older than a
+cutoff are moved to NotificationArchive (or dropped) in bounded batches.
+
+On Postgres the live table can optionally be range-partitioned by month
+on created_at (convert_to_partitioned). Expired months holding only read
+notifications are then archived and dropped as whole partitions instead
+of row by row.
+"""
+from datetime import date, datetime, timezone as dt_timezone
+from django.db import connection, transaction
+from .models import Notification, NotificationArchive
+
+# Columns copied into the archive (same names on both tables)
+ARCHIVE_FIELDS = (
+    'id', 'recipient_id', 'sender_id', 'notification_type', 'title',
+    'message', 'count', 'ride_id', 'booking_id', 'created_at', 'read_at',
+)
+
+TABLE = Notification._meta.db_table
+ARCHIVE_TABLE = NotificationArchive._meta.db_table
+
+
+def prune_batch(cutoff, batch_size=1000, archive=True):
+    """
+    Archive (or just delete) up to batch_size read notifications created
+    before cutoff, oldest first, in one short transaction. Rows locked by
+    concurrent work are skipped. Returns the number of rows removed.
+    """
+    with transaction.atomic():
+        rows = list(
+            Notification.objects.select_for_update(skip_locked=True)
+            .filter(is_read=True, created_at__lt=cutoff)
+            .order_by('created_at')
+            .values(*ARCHIVE_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0
+        
+        if archive:
+            NotificationArchive.objects.bulk_create(
+                [NotificationArchive(**row) for row in rows],
+                ignore_conflicts=True
+            )
+        Notification.objects.filter(id__in=[row['id'] for row in rows]).delete()
+    
+    return len(rows)
+
+
+# --- Postgres monthly partitioning -------------------------------------------
+
+def _month(day, offset=0):
+    index = day.year * 12 + day.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partition_name(month):
+    return f'{TABLE}_y{month.year}m{month.month:02d}'
+
+
+def _quote(name):
+    return connection.ops.quote_name(name)
+
+
+def is_partitioned():
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def monthly_partitions():
+    """{first day of month: partition table name} of the live table"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(%s)",
+            [TABLE]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    
+    partitions = {}
+    prefix = f'{TABLE}_y'
+    for name in names:
+        if name.startswith(prefix):
+            year, month = name[len(prefix):].split('m')
+            partitions[date(int(year), int(month), 1)] = name
+    return partitions
+
+
+def _create_partition(cursor, month):
+    """
+    Create a month's partition. Postgres refuses to while the default
+    partition holds rows of that month, so those are moved into the new
+    partition: the default is detached, the partition created, the rows
+    re-inserted through the parent and the default attached again, all
+    under the caller's transaction and the parent's exclusive lock.
+    """
+    name = _partition_name(month)
+    bounds = [f'{month.isoformat()} 00:00:00+00', f'{_month(month, 1).isoformat()} 00:00:00+00']
+    default = TABLE + '_default'
+    
+    cursor.execute('SELECT to_regclass(%s) IS NOT NULL, to_regclass(%s) IS NOT NULL', [name, default])
+    exists, has_default = cursor.fetchone()
+    if exists:
+        return
+    
+    stranded = False
+    if has_default:
+        cursor.execute(f'LOCK TABLE {_quote(TABLE)} IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(
+            f'SELECT 1 FROM {_quote(default)} WHERE created_at >= %s AND created_at < %s LIMIT 1',
+            bounds
+        )
+        stranded = cursor.fetchone() is not None
+    
+    if stranded:
+        cursor.execute(f'ALTER TABLE {_quote(TABLE)} DETACH PARTITION {_quote(default)}')
+    cursor.execute(
+        f'CREATE TABLE {_quote(name)} PARTITION OF {_quote(TABLE)} FOR VALUES FROM (%s) TO (%s)',
+        bounds
+    )
+    if stranded:
+        cursor.execute(
+            f'INSERT INTO {_quote(TABLE)} SELECT * FROM {_quote(default)} '
+            f'WHERE created_at >= %s AND created_at < %s',
+            bounds
+        )
+        cursor.execute(
+            f'DELETE FROM {_quote(default)} WHERE created_at >= %s AND created_at < %s',
+            bounds
+        )
+        cursor.execute(f'ALTER TABLE {_quote(TABLE)} ATTACH PARTITION {_quote(default)} DEFAULT')
+
+
+def ensure_partitions(months_ahead=3):
+    """
+    Create the monthly partitions up to months_ahead from now, and one for
+    every month whose rows sit in the default partition
+    """
+    today = date.today()
+    months = {_month(today, offset) for offset in range(months_ahead + 1)}
+    default = TABLE + '_default'
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [default])
+        if cursor.fetchone()[0]:
+            cursor.execute(
+                "SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC')::date "
+                f"FROM {_quote(default)}"
+            )
+            months.update(row[0] for row in cursor.fetchall())
+        for month in sorted(months):
+            _create_partition(cursor, month)
+
+
+def convert_to_partitioned(months_ahead=3):
+    """
+    One-time conversion of the live table into a table range-partitioned
+    by month on created_at, keeping its rows, indexes, foreign keys and id
+    sequence. The table is locked for the duration of the copy.
+    """
+    legacy = f'{TABLE}_legacy'
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE {_quote(TABLE)} IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname <> %s",
+            [TABLE, f'{TABLE}_pkey']
+        )
+        index_definitions = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype = 'f'",
+            [TABLE]
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f'SELECT MIN(created_at) FROM {_quote(TABLE)}')
+        oldest = cursor.fetchone()[0] or datetime.now(dt_timezone.utc)
+        
+        cursor.execute(f'ALTER TABLE {_quote(TABLE)} RENAME TO {_quote(legacy)}')
+        cursor.execute(
+            f'CREATE TABLE {_quote(TABLE)} (LIKE {_quote(legacy)} INCLUDING DEFAULTS '
+            f'INCLUDING IDENTITY INCLUDING CONSTRAINTS) PARTITION BY RANGE (created_at)'
+        )
+        
+        month, last = _month(oldest.date()), _month(date.today(), months_ahead)
+        while month <= last:
+            _create_partition(cursor, month)
+            month = _month(month, 1)
+        cursor.execute(
+            f'CREATE TABLE {_quote(TABLE + "_default")} PARTITION OF {_quote(TABLE)} DEFAULT'
+        )
+        
+        cursor.execute(f'INSERT INTO {_quote(TABLE)} SELECT * FROM {_quote(legacy)}')
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE(MAX(id), 0) + 1, false) "
+            f"FROM {_quote(TABLE)}",
+            [TABLE]
+        )
+        cursor.execute(f'DROP TABLE {_quote(legacy)}')
+        
+        # Unique keys of a partitioned table must include the partition key
+        cursor.execute(f'ALTER TABLE {_quote(TABLE)} ADD PRIMARY KEY (id, created_at)')
+        for definition in index_definitions:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(
+                f'ALTER TABLE {_quote(TABLE)} ADD CONSTRAINT {_quote(name)} {definition}'
+            )
+
+
+def drop_expired_partitions(cutoff, archive=True):
+    """
+    Remove whole monthly partitions that end before cutoff and hold no
+    unread notifications, archiving their rows first. Returns the number
+    of rows removed.
+    """
+    removed = 0
+    for month, name in sorted(monthly_partitions().items()):
+        end = _month(month, 1)
+        if datetime(end.year, end.month, 1, tzinfo=dt_timezone.utc) > cutoff:
+            continue
+        
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'LOCK TABLE {_quote(name)} IN ACCESS EXCLUSIVE MODE')
+            cursor.execute(f'SELECT 1 FROM {_quote(name)} WHERE NOT is_read LIMIT 1')
+            if cursor.fetchone() is not None:
+                continue
+            
+            columns = ', '.join(_quote(field) for field in ARCHIVE_FIELDS)
+            if archive:
+                cursor.execute(
+                    f'INSERT INTO {_quote(ARCHIVE_TABLE)} ({columns}) '
+                    f'SELECT {columns} FROM {_quote(name)} ON CONFLICT DO NOTHING'
+                )
+            cursor.execute(f'SELECT COUNT(*) FROM {_quote(name)}')
+            removed += cursor.fetchone()[0]
+            cursor.execute(f'ALTER TABLE {_quote(TABLE)} DETACH PARTITION {_quote(name)}')
+            cursor.execute(f'DROP TABLE {_quote(name)}')
+    
+    return removed
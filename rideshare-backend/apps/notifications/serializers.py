@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Notification
+from apps.core.serializers import ThumbnailsField
 from apps.users.serializers import UserPublicSerializer
 from apps.rides.serializers import RideListSerializer
 from apps.bookings.serializers import BookingListSerializer
@@ -14,26 +15,28 @@ class NotificationSerializer(serializers.ModelSerializer):
         model = Notification
         fields = (
             'id', 'recipient', 'sender', 'notification_type',
-            'title', 'message', 'ride', 'booking', 'is_read',
-            'read_at', 'created_at', 'updated_at'
+            'title', 'message', 'count', 'actors', 'ride', 'booking',
+            'is_read', 'read_at', 'created_at', 'updated_at'
         )
         read_only_fields = (
             'id', 'recipient', 'sender', 'notification_type',
-            'title', 'message', 'ride', 'booking', 'read_at',
+            'title', 'message', 'count', 'actors', 'ride', 'booking', 'read_at',
             'created_at', 'updated_at'
         )
 
 
 class NotificationListSerializer(serializers.ModelSerializer):
     """Compact notification serializer for lists"""
-    sender_name = serializers.CharField(source='sender.full_name', read_only=True)
-    sender_avatar = serializers.ImageField(source='sender.avatar', read_only=True)
+    # Digests have no sender
+    sender_name = serializers.CharField(source='sender.full_name', read_only=True, default=None)
+    sender_avatar = serializers.ImageField(source='sender.avatar', read_only=True, default=None)
+    sender_avatar_thumbnails = ThumbnailsField(source='sender.avatar', default=None)
     
     class Meta:
         model = Notification
         fields = (
-            'id', 'notification_type', 'title', 'message',
-            'sender_name', 'sender_avatar', 'is_read',
+            'id', 'notification_type', 'title', 'message', 'count',
+            'actors', 'sender_name', 'sender_avatar', 'sender_avatar_thumbnails', 'is_read',
             'created_at', 'ride', 'booking'
         )
         read_only_fields = fields
@@ -0,0 +1,36 @@
+"""
+Single-use tickets authenticating the notification stream.
+
+EventSource can't send an Authorization header, and an access token in
+the URL would end up in access and proxy logs. An authenticated POST
+issues a random ticket instead, valid for NOTIFICATION_STREAM_TICKET_SECONDS
+and consumed by the first stream request that presents it. Tickets live
+in the default cache, which must be shared by the server processes.
+"""
+import secrets
+from django.conf import settings
+from django.core.cache import cache
+
+KEY_PREFIX = 'notification_stream_ticket'
+
+
+def _key(ticket):
+    return f'{KEY_PREFIX}:{ticket}'
+
+
+def issue_ticket(user_id):
+    ticket = secrets.token_urlsafe(32)
+    cache.set(_key(ticket), user_id, timeout=settings.NOTIFICATION_STREAM_TICKET_SECONDS)
+    return ticket
+
+
+def redeem_ticket(ticket):
+    """User id of a valid ticket, which can't be used again; None otherwise"""
+    if not ticket:
+        return None
+    key = _key(ticket)
+    user_id = cache.get(key)
+    # Of concurrent requests presenting the same ticket, only one deletes it
+    if user_id is None or not cache.delete(key):
+        return None
+    return user_id
@@ -4,7 +4,9 @@ from .views import (
     NotificationDetailView,
     mark_as_read,
     mark_all_as_read,
-    unread_count
+    unread_count,
+    stream_ticket,
+    notification_stream
 )
 
 app_name = 'notifications'
@@ -12,6 +14,8 @@ app_name = 'notifications'
 urlpatterns = [
     path('', NotificationListView.as_view(), name='notification-list'),
     path('unread-count/', unread_count, name='unread-count'),
+    path('stream/', notification_stream, name='stream'),
+    path('stream/ticket/', stream_ticket, name='stream-ticket'),
     path('mark-all-read/', mark_all_as_read, name='mark-all-read'),
     path('<int:pk>/', NotificationDetailView.as_view(), name='notification-detail'),
     path('<int:pk>/read/', mark_as_read, name='mark-as-read'),
@@ -1,7 +1,21 @@
+import asyncio
+import json
+from asgiref.sync import sync_to_async
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET
+from apps.users.authentication import CachedJWTAuthentication
+from . import events, tickets
+from .counters import add_unread, unread_count as stored_unread_count
 from .models import Notification
 from .serializers import (
     NotificationSerializer,
@@ -13,9 +27,11 @@ class NotificationListView(generics.ListAPIView):
     """
     GET /api/notifications/ - List user's notifications
     Query params: ?type=ride_request&is_read=false
+    &pagination=cursor for keyset pages
     """
     serializer_class = NotificationListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    keyset_field = 'created_at'
     
     def get_queryset(self):
         user = self.request.user
@@ -62,7 +78,9 @@ def mark_as_read(request, pk):
         recipient=request.user
     )
     
-    notification.mark_as_read()
+    if not notification.is_read:
+        notification.mark_as_read()
+        events.publish_unread_counts({request.user.id})
     
     return Response(
         NotificationSerializer(notification).data,
@@ -78,13 +96,17 @@ def mark_all_as_read(request):
     """
     from django.utils import timezone
     
-    updated_count = Notification.objects.filter(
-        recipient=request.user,
-        is_read=False
-    ).update(
-        is_read=True,
-        read_at=timezone.now()
-    )
+    with transaction.atomic():
+        updated_count = Notification.objects.filter(
+            recipient=request.user,
+            is_read=False
+        ).update(
+            is_read=True,
+            read_at=timezone.now()
+        )
+        if updated_count:
+            add_unread({request.user.id: -updated_count})
+            events.publish_unread_counts({request.user.id})
     
     return Response(
         {'message': f'{updated_count} notifications marked as read'},
@@ -97,13 +119,98 @@ def mark_all_as_read(request):
 def unread_count(request):
     """
     GET /api/notifications/unread-count/ - Get count of unread notifications
+    (from the stored per-user counter)
     """
-    count = Notification.objects.filter(
-        recipient=request.user,
-        is_read=False
-    ).count()
+    count = stored_unread_count(request.user.id)
     
     return Response(
         {'count': count},
         status=status.HTTP_200_OK
     )
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def stream_ticket(request):
+    """
+    POST /api/notifications/stream/ticket/ - Single-use ticket for opening
+    the notification stream (EventSource can't send the Authorization header)
+    """
+    return Response(
+        {
+            'ticket': tickets.issue_ticket(request.user.id),
+            'expires_in': settings.NOTIFICATION_STREAM_TICKET_SECONDS
+        },
+        status=status.HTTP_201_CREATED
+    )
+
+
+def _stream_user(request):
+    """User from a ?ticket= issued by stream_ticket or the Authorization header"""
+    ticket = request.GET.get('ticket')
+    if ticket:
+        user_id = tickets.redeem_ticket(ticket)
+        if user_id is None:
+            return None
+        return get_user_model().objects.filter(pk=user_id).first()
+    
+    authenticator = CachedJWTAuthentication()
+    try:
+        result = authenticator.authenticate(request)
+        return result[0] if result else None
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return None
+
+
+def _sse(event, data):
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+@require_GET
+async def notification_stream(request):
+    """
+    GET /api/notifications/stream/?ticket=<stream ticket> - Server-Sent Events
+    Sends the unread count on connect, then `notification` and
+    `unread_count` events as they happen. Served by the ASGI app only.
+    A ticket opens one stream; reconnect with a new one.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {'error': 'The notification stream is only served over ASGI'},
+            status=status.HTTP_501_NOT_IMPLEMENTED
+        )
+    
+    user = await sync_to_async(_stream_user)(request)
+    if user is None or not user.is_active:
+        return JsonResponse(
+            {'error': 'Authentication credentials were not provided or are invalid'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+    
+    events.start_listener()
+    keepalive = settings.NOTIFICATION_STREAM_KEEPALIVE
+    
+    async def stream():
+        # Subscribe before reading the count so no change is missed
+        queue = events.broker.subscribe(user.id)
+        try:
+            yield 'retry: 5000\n\n'
+            yield _sse('unread_count', {'count': await sync_to_async(stored_unread_count)(user.id)})
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), keepalive)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                data = event['data']
+                if event['event'] == 'notification':
+                    # Published without a request: link media like the REST responses
+                    data = events.absolute_urls(data, request.build_absolute_uri)
+                yield _sse(event['event'], data)
+        finally:
+            events.broker.unsubscribe(user.id, queue)
+    
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
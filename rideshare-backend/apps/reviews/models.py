@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 from apps.core.models import TimeStampedModel
@@ -37,11 +37,33 @@ class Review(TimeStampedModel):
             models.Index(fields=['reviewee', 'rating']),
         ]
     
+    def __init__(self, *args, **kwargs):
+        """Store original rating for change detection"""
+        super().__init__(*args, **kwargs)
+        # Deferred loads (.only()/.defer()) would fetch rating row by row
+        if self.pk and 'rating' not in self.get_deferred_fields():
+            self._original_rating = self.rating
+        else:
+            self._original_rating = None
+    
     def __str__(self):
         return f"{self.reviewer.email} → {self.reviewee.email} ({self.rating}⭐)"
     
     def save(self, *args, **kwargs):
         """Validate that reviewer and reviewee are different"""
-        if self.reviewer == self.reviewee:
+        if self.reviewer_id == self.reviewee_id:
             raise ValueError("Cannot review yourself")
-        super().save(*args, **kwargs)
\ No newline at end of file
+        # Keep the reviewee's rating aggregates in the same transaction
+        with transaction.atomic():
+            if self._original_rating is None and not self._state.adding:
+                # Loaded with rating deferred: the signal needs the stored value
+                self._original_rating = Review.objects.filter(
+                    pk=self.pk
+                ).values_list('rating', flat=True).first()
+            super().save(*args, **kwargs)
+    
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            if 'rating' in self.get_deferred_fields():
+                self.refresh_from_db(fields=['rating'])
+            return super().delete(*args, **kwargs)
\ No newline at end of file
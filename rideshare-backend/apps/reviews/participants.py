@@ -0,0 +1,98 @@
+from django.db.models import Case, Exists, F, FilteredRelation, OuterRef, Q, When
+from apps.bookings.models import Booking
+from apps.rides.models import Ride
+from .models import Review
+
+
+class RideParticipants:
+    """
+    Who took part in a ride (its driver and accepted passengers) and whom
+    one reviewer has already reviewed on it
+    """
+
+    def __init__(self, ride_id, driver_id, passenger_ids, reviewed_ids):
+        self.ride_id = ride_id
+        self.driver_id = driver_id
+        self.passenger_ids = frozenset(passenger_ids)
+        self.reviewed_ids = set(reviewed_ids)
+
+    @property
+    def member_ids(self):
+        return self.passenger_ids | {self.driver_id}
+
+    def includes(self, user_id):
+        return user_id in self.member_ids
+
+    def co_rider_ids(self, user_id):
+        """Participants other than user_id"""
+        return self.member_ids - {user_id}
+
+    def unreviewed_ids(self, user_id):
+        """Co-riders the reviewer has not reviewed on this ride yet"""
+        return self.co_rider_ids(user_id) - self.reviewed_ids
+
+
+def resolve_participants(ride_id, reviewer_id):
+    """
+    Load a ride's participants and the reviewer's existing reviews on it in
+    one query: the ride joined to its accepted bookings and to the
+    reviewer's reviews. Returns None for an unknown ride.
+    """
+    rows = Ride.objects.filter(pk=ride_id).annotate(
+        accepted=FilteredRelation('bookings', condition=Q(bookings__status='accepted')),
+        given=FilteredRelation('reviews', condition=Q(reviews__reviewer_id=reviewer_id)),
+    ).values_list('driver_id', 'accepted__passenger_id', 'given__reviewee_id')
+    rows = list(rows)
+    if not rows:
+        return None
+    return RideParticipants(
+        ride_id,
+        rows[0][0],
+        {passenger_id for _, passenger_id, _ in rows if passenger_id is not None},
+        {reviewee_id for _, _, reviewee_id in rows if reviewee_id is not None},
+    )
+
+
+def get_participants(request, ride_id):
+    """resolve_participants for the requesting user, cached on the request"""
+    cache = getattr(request, '_ride_participants', None)
+    if cache is None:
+        cache = request._ride_participants = {}
+    if ride_id not in cache:
+        cache[ride_id] = resolve_participants(ride_id, request.user.pk)
+    return cache[ride_id]
+
+
+def pending_reviews(user_id):
+    """
+    Accepted bookings standing for each (completed ride, co-rider) pair the
+    user took part in but hasn't reviewed, annotated with reviewee_id:
+    
+    - the user's own booking stands for the ride's driver
+    - every other accepted booking stands for its passenger
+    
+    Pairs already reviewed are removed by a NOT EXISTS anti-join on the
+    (ride, reviewer, reviewee) unique index of Review. One query.
+    """
+    taken = Booking.objects.filter(
+        passenger_id=user_id,
+        status='accepted'
+    ).values('ride_id')
+    rides = Ride.objects.filter(
+        Q(driver_id=user_id) | Q(pk__in=taken),
+        status='completed'
+    ).values('pk')
+    reviewed = Review.objects.filter(
+        ride_id=OuterRef('ride_id'),
+        reviewer_id=user_id,
+        reviewee_id=OuterRef('reviewee_id')
+    )
+    return Booking.objects.filter(
+        ride__in=rides,
+        status='accepted'
+    ).annotate(
+        reviewee_id=Case(
+            When(passenger_id=user_id, then=F('ride__driver_id')),
+            default=F('passenger_id')
+        )
+    ).filter(~Exists(reviewed))
@@ -1,5 +1,8 @@
+from django.db import transaction
 from rest_framework import serializers
 from .models import Review
+from .participants import get_participants
+from .signals import update_reviewee_ratings
 from apps.users.serializers import UserPublicSerializer
 
 
@@ -17,43 +20,26 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
         return value
     
     def validate(self, data):
-        """Validate review data"""
+        """Validate review data against the ride's participants (one query)"""
         user = self.context['request'].user
         ride = data['ride']
         reviewee = data['reviewee']
+        participants = get_participants(self.context['request'], ride.pk)
         
         # Check if user was part of this ride
-        was_driver = ride.driver == user
-        was_passenger = ride.bookings.filter(
-            passenger=user,
-            status='accepted'
-        ).exists()
-        
-        if not (was_driver or was_passenger):
+        if not participants.includes(user.pk):
             raise serializers.ValidationError(
                 "You must be a participant of this ride to leave a review"
             )
         
         # Check if reviewee was part of the ride
-        reviewee_was_driver = ride.driver == reviewee
-        reviewee_was_passenger = ride.bookings.filter(
-            passenger=reviewee,
-            status='accepted'
-        ).exists()
-        
-        if not (reviewee_was_driver or reviewee_was_passenger):
+        if not participants.includes(reviewee.pk):
             raise serializers.ValidationError(
                 "Reviewee must be a participant of this ride"
             )
         
         # Check if user already reviewed this person for this ride
-        existing_review = Review.objects.filter(
-            ride=ride,
-            reviewer=user,
-            reviewee=reviewee
-        ).first()
-        
-        if existing_review:
+        if reviewee.pk in participants.reviewed_ids:
             raise serializers.ValidationError(
                 "You have already reviewed this user for this ride"
             )
@@ -69,7 +55,107 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """Create review with reviewer from request"""
         validated_data['reviewer'] = self.context['request'].user
-        return super().create(validated_data)
+        review = super().create(validated_data)
+        get_participants(self.context['request'], review.ride_id).reviewed_ids.add(review.reviewee_id)
+        return review
+
+
+class ReviewBatchItemSerializer(serializers.Serializer):
+    """One co-rider's review in a batch"""
+    reviewee = serializers.IntegerField()
+    rating = serializers.IntegerField(min_value=1, max_value=5)
+    comment = serializers.CharField(required=False, allow_blank=True, default='')
+
+
+class ReviewBatchCreateSerializer(serializers.Serializer):
+    """Serializer for reviewing several co-riders of a ride at once"""
+    ride = serializers.IntegerField()
+    reviews = ReviewBatchItemSerializer(many=True, allow_empty=False)
+    
+    def validate(self, data):
+        """Check every review against the ride's participants in memory"""
+        user = self.context['request'].user
+        participants = get_participants(self.context['request'], data['ride'])
+        
+        if participants is None:
+            raise serializers.ValidationError({'ride': "Ride not found"})
+        
+        if not participants.includes(user.pk):
+            raise serializers.ValidationError(
+                "You must be a participant of this ride to leave a review"
+            )
+        
+        reviewee_ids = [item['reviewee'] for item in data['reviews']]
+        if len(set(reviewee_ids)) != len(reviewee_ids):
+            raise serializers.ValidationError(
+                "Each co-rider can only be reviewed once"
+            )
+        
+        for reviewee_id in reviewee_ids:
+            if reviewee_id == user.pk:
+                raise serializers.ValidationError("Cannot review yourself")
+            if not participants.includes(reviewee_id):
+                raise serializers.ValidationError(
+                    f"User {reviewee_id} was not a participant of this ride"
+                )
+            if reviewee_id in participants.reviewed_ids:
+                raise serializers.ValidationError(
+                    f"You have already reviewed user {reviewee_id} for this ride"
+                )
+        
+        return data
+    
+    def create(self, validated_data):
+        """Insert all reviews with one bulk_create and update the ratings together"""
+        user = self.context['request'].user
+        ride_id = validated_data['ride']
+        items = validated_data['reviews']
+        
+        with transaction.atomic():
+            reviews = Review.objects.bulk_create([
+                Review(
+                    ride_id=ride_id,
+                    reviewer=user,
+                    reviewee_id=item['reviewee'],
+                    rating=item['rating'],
+                    comment=item['comment']
+                )
+                for item in items
+            ])
+            update_reviewee_ratings([
+                (item['reviewee'], None, item['rating']) for item in items
+            ])
+        
+        get_participants(self.context['request'], ride_id).reviewed_ids.update(
+            item['reviewee'] for item in items
+        )
+        return reviews
+
+
+class PendingReviewSerializer(serializers.Serializer):
+    """A co-rider the user still owes a review (rows of pending_reviews())"""
+    ride = serializers.SerializerMethodField()
+    reviewee = serializers.SerializerMethodField()
+    role = serializers.SerializerMethodField()
+    
+    def _reviewee_is_driver(self, obj):
+        return obj.reviewee_id == obj.ride.driver_id
+    
+    def get_ride(self, obj):
+        return {
+            'id': obj.ride.id,
+            'origin': obj.ride.origin,
+            'destination': obj.ride.destination,
+            'departure_time': obj.ride.departure_time,
+        }
+    
+    def get_reviewee(self, obj):
+        user = obj.ride.driver if self._reviewee_is_driver(obj) else obj.passenger
+        return UserPublicSerializer(user, context=self.context).data
+    
+    def get_role(self, obj):
+        """The reviewee's role on the ride"""
+        return 'driver' if self._reviewee_is_driver(obj) else 'passenger'
 
 
 class ReviewSerializer(serializers.ModelSerializer):
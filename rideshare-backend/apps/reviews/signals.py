@@ -0,0 +1,101 @@
+from collections import defaultdict
+from django.conf import settings
+from django.db.models import Case, F, FloatField, IntegerField, Value, When
+from django.db.models.functions import Cast
+from django.db.models.lookups import GreaterThan
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.users.models import User
+from .models import Review
+
+
+def reputation_expression(rating_sum, rating_count):
+    """
+    Bayesian average of a user's ratings: REPUTATION_PRIOR_WEIGHT virtual
+    reviews at REPUTATION_PRIOR_MEAN are added to the real ones, so a few
+    reviews move the score less than many
+    """
+    weight = float(settings.REPUTATION_PRIOR_WEIGHT)
+    prior = weight * float(settings.REPUTATION_PRIOR_MEAN)
+    return (
+        (Cast(rating_sum, FloatField()) + Value(prior))
+        / (Cast(rating_count, FloatField()) + Value(weight))
+    )
+
+
+def update_reviewee_rating(reviewee_id, old_rating, new_rating):
+    """
+    Apply a review change to the reviewee's stored rating aggregates
+    in a single UPDATE, so concurrent reviews never lose an increment.
+    old_rating is None for a new review, new_rating None for a deleted one.
+    """
+    update_reviewee_ratings([(reviewee_id, old_rating, new_rating)])
+
+
+def update_reviewee_ratings(changes):
+    """
+    Apply (reviewee_id, old_rating, new_rating) changes to the reviewees'
+    rating sums, counts, star histograms, averages and reputations in one
+    UPDATE (reviews created by bulk_create send no post_save)
+    """
+    deltas = defaultdict(lambda: defaultdict(int))
+    for reviewee_id, old_rating, new_rating in changes:
+        for rating, sign in ((old_rating, -1), (new_rating, 1)):
+            if rating is not None:
+                deltas[reviewee_id]['rating_sum'] += sign * rating
+                deltas[reviewee_id]['rating_count'] += sign
+                deltas[reviewee_id][f'rating_{rating}_count'] += sign
+    
+    columns = {
+        column
+        for delta in deltas.values()
+        for column, value in delta.items() if value
+    }
+    if not columns:
+        return
+    
+    def new_value(column):
+        return F(column) + Case(
+            *[
+                When(pk=reviewee_id, then=Value(delta[column]))
+                for reviewee_id, delta in deltas.items() if delta[column]
+            ],
+            default=Value(0),
+            output_field=IntegerField()
+        )
+    
+    new_sum = new_value('rating_sum')
+    new_count = new_value('rating_count')
+    User.objects.filter(pk__in=deltas).update(
+        **{column: new_value(column) for column in columns},
+        rating_average=Case(
+            When(GreaterThan(new_count, 0), then=Cast(new_sum, FloatField()) / Cast(new_count, FloatField())),
+            default=Value(0.0),
+            output_field=FloatField()
+        ),
+        reputation=reputation_expression(new_sum, new_count)
+    )
+
+
+@receiver(post_save, sender=Review)
+def add_review_rating(sender, instance, created, **kwargs):
+    """
+    Add a new review to the reviewee's rating, or apply the difference
+    when an existing review's rating is edited
+    """
+    if created:
+        update_reviewee_rating(instance.reviewee_id, None, instance.rating)
+    elif instance._original_rating is not None and instance._original_rating != instance.rating:
+        update_reviewee_rating(
+            instance.reviewee_id,
+            instance._original_rating,
+            instance.rating
+        )
+    
+    instance._original_rating = instance.rating
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_rating(sender, instance, **kwargs):
+    """Remove a deleted review from the reviewee's rating"""
+    update_reviewee_rating(instance.reviewee_id, instance.rating, None)
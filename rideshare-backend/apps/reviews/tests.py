@@ -1,3 +1,41 @@
+from datetime import timedelta
 from django.test import TestCase
+from django.utils import timezone
+from apps.rides.models import Ride
+from apps.users.models import User
+from .models import Review
 
-# Create your tests here.
+
+class ReviewRatingAggregateTests(TestCase):
+    """Stored rating aggregates follow reviews loaded with rating deferred"""
+
+    def setUp(self):
+        self.driver, self.first, self.second = [
+            User.objects.create_user(email=f'{name}@example.com', username=name, password='pw')
+            for name in ('driver', 'first', 'second')
+        ]
+        ride = Ride.objects.create(
+            driver=self.driver, origin='Boston', destination='New York',
+            departure_time=timezone.now() + timedelta(days=1),
+            price=20, seats_available=3, total_seats=3
+        )
+        Review.objects.create(ride=ride, reviewer=self.first, reviewee=self.driver, rating=4)
+        Review.objects.create(ride=ride, reviewer=self.second, reviewee=self.driver, rating=2)
+
+    def assertAggregates(self, rating_sum, rating_count):
+        self.driver.refresh_from_db()
+        self.assertEqual((self.driver.rating_sum, self.driver.rating_count), (rating_sum, rating_count))
+
+    def test_deferred_load_queries_once(self):
+        with self.assertNumQueries(1):
+            list(Review.objects.only('id', 'reviewee_id'))
+
+    def test_update_with_deferred_rating(self):
+        review = Review.objects.only('id', 'reviewer_id', 'reviewee_id').get(reviewer=self.first)
+        review.rating = 5
+        review.save()
+        self.assertAggregates(7, 2)
+
+    def test_delete_with_deferred_rating(self):
+        Review.objects.only('id', 'reviewee_id').get(reviewer=self.second).delete()
+        self.assertAggregates(4, 1)
@@ -1,5 +1,7 @@
 from django.urls import path
 from .views import (
+    PendingReviewsView,
+    ReviewBatchCreateView,
     ReviewCreateView,
     ReviewListView,
     ReviewDetailView,
@@ -12,6 +14,8 @@ app_name = 'reviews'
 urlpatterns = [
     path('', ReviewListView.as_view(), name='review-list'),
     path('create/', ReviewCreateView.as_view(), name='review-create'),
+    path('batch/', ReviewBatchCreateView.as_view(), name='review-batch-create'),
+    path('pending/', PendingReviewsView.as_view(), name='pending-reviews'),
     path('user/<int:user_id>/', UserReviewsView.as_view(), name='user-reviews'),
     path('ride/<int:ride_id>/', RideReviewsView.as_view(), name='ride-reviews'),
     path('<int:pk>/', ReviewDetailView.as_view(), name='review-detail'),
@@ -1,7 +1,10 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from .models import Review
+from .participants import pending_reviews
 from .serializers import (
+    PendingReviewSerializer,
+    ReviewBatchCreateSerializer,
     ReviewCreateSerializer,
     ReviewSerializer,
     ReviewListSerializer
@@ -27,6 +30,44 @@ class ReviewCreateView(generics.CreateAPIView):
         )
 
 
+class ReviewBatchCreateView(generics.CreateAPIView):
+    """
+    POST /api/reviews/batch/ - Review several co-riders of a ride at once
+    Body: {"ride": <id>, "reviews": [{"reviewee": <id>, "rating": 5, "comment": ""}, ...]}
+    """
+    serializer_class = ReviewBatchCreateSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        reviews = serializer.save()
+        
+        created = Review.objects.filter(
+            pk__in=[review.pk for review in reviews]
+        ).select_related('reviewer', 'reviewee', 'ride')
+        return Response(
+            ReviewSerializer(created, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class PendingReviewsView(generics.ListAPIView):
+    """
+    GET /api/reviews/pending/ - Co-riders of the user's completed rides
+    not reviewed yet, latest rides first, in cursor pages
+    """
+    serializer_class = PendingReviewSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    keyset_field = 'ride__departure_time'
+    keyset_default = True
+    
+    def get_queryset(self):
+        return pending_reviews(self.request.user.pk).select_related(
+            'ride', 'ride__driver', 'passenger'
+        ).order_by('-ride__departure_time', '-id')
+
+
 class ReviewListView(generics.ListAPIView):
     """
     GET /api/reviews/ - List reviews
@@ -23,7 +23,8 @@ class RideAdmin(admin.ModelAdmin):
             'fields': ('driver',)
         }),
         ('Route', {
-            'fields': ('origin', 'origin_address', 'destination', 'destination_address')
+            'fields': ('origin', 'origin_address', 'destination', 'destination_address',
+                       'route')
         }),
         ('Schedule', {
             'fields': ('departure_time', 'arrival_time')
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class RidesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.rides'
+    
+    def ready(self):
+        import apps.rides.checks
+        import apps.rides.signals
@@ -0,0 +1,77 @@
+import threading
+import time
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+from .models import Ride
+from .places import PlaceIndex
+
+
+# _lock guards reads and updates of the index; _build_lock lets one
+# thread rebuild it while the others keep serving the previous one
+_lock = threading.Lock()
+_build_lock = threading.Lock()
+_index = None
+
+
+def _build():
+    """Load ride counts per place for upcoming rides (two grouped queries)"""
+    index = PlaceIndex()
+    upcoming = Ride.objects.filter(status='upcoming', departure_time__gte=timezone.now())
+    for field in ('origin', 'destination'):
+        rows = upcoming.order_by().values(f'{field}_key').annotate(
+            label=Min(field),
+            rides=Count('id')
+        )
+        for row in rows:
+            index.add(row['label'], row['rides'])
+    index.built_at = time.monotonic()
+    return index
+
+
+def _is_stale(index):
+    return index is None or time.monotonic() - index.built_at > PlaceIndex.REBUILD_SECONDS
+
+
+def _refresh():
+    """
+    Rebuild a stale index outside _lock and swap it in. Without an index
+    yet, wait for the thread building it; otherwise a stale index keeps
+    being served while one thread rebuilds.
+    """
+    global _index
+    if not _build_lock.acquire(blocking=_index is None):
+        return
+    try:
+        if _is_stale(_index):
+            index = _build()
+            with _lock:
+                _index = index
+    finally:
+        _build_lock.release()
+
+
+def suggest(prefix, limit=PlaceIndex.TOP_K):
+    """Return [(place, upcoming_ride_count)] for places starting with prefix"""
+    if _is_stale(_index):
+        _refresh()
+    with _lock:
+        return _index.search(prefix, limit)
+
+
+def record_ride_change(old_places, new_places):
+    """
+    Move a ride's contribution from old_places to new_places once the
+    transaction commits. Either may be empty (ride created, cancelled or
+    deleted). Nothing happens until the index has been built.
+    """
+    def apply():
+        with _lock:
+            if _index is None:
+                return
+            for place in old_places:
+                _index.add(place, -1)
+            for place in new_places:
+                _index.add(place, 1)
+    
+    transaction.on_commit(apply)
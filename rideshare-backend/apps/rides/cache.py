@@ -0,0 +1,98 @@
+import hashlib
+import json
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from .places import normalize_place
+
+
+# Cached search pages are keyed by two generation counters, one for the
+# search's origin term and one for its destination term. A search on a
+# term can only return rides whose normalized place starts with it, so a
+# write on a route bumps the counters of every prefix of its origin and
+# of its destination: no registry of live searches is needed, and a
+# write costs one set_many. ?match=contains terms may match anywhere in
+# a place and share one counter bumped by every write.
+#
+# Counters must live in a cache shared by every server process (see
+# apps.rides.checks), or other processes serve stale pages until they expire.
+KEY_PREFIX = 'ride_search'
+CONTAINS_GENERATION_KEY = f'{KEY_PREFIX}:gen:contains'
+
+# Terms longer than this share the counter of their first characters,
+# bounding the keys a write bumps
+MAX_TERM_LENGTH = 64
+
+
+def _digest(value):
+    return hashlib.sha1(json.dumps(value).encode()).hexdigest()
+
+
+def _generation_key(side, term):
+    return f'{KEY_PREFIX}:gen:{side}:{_digest(term[:MAX_TERM_LENGTH])}'
+
+
+def _generation_keys(request):
+    """Counters a search request's page depends on"""
+    params = request.query_params
+    if params.get('match') == 'contains':
+        return [CONTAINS_GENERATION_KEY]
+    return [
+        _generation_key('origin', normalize_place(params.get('origin'))),
+        _generation_key('destination', normalize_place(params.get('destination'))),
+    ]
+
+
+def _route_generation_keys(origin, destination):
+    """Counters of every search that could return a ride on this route"""
+    keys = [CONTAINS_GENERATION_KEY]
+    for side, place in (('origin', origin), ('destination', destination)):
+        place = place[:MAX_TERM_LENGTH]
+        keys.extend(_generation_key(side, place[:length]) for length in range(len(place) + 1))
+    return keys
+
+
+def get_cached_page(request):
+    """
+    Return (cache_key, data) for a search request; data is None on a miss.
+    The key embeds the current generations of the search's terms, so
+    entries written before an invalidation are never read again.
+    """
+    keys = _generation_keys(request)
+    generations = cache.get_many(keys)
+    missing = {key: uuid.uuid4().hex for key in keys if key not in generations}
+    if missing:
+        # Counter never set or evicted: start a fresh generation
+        cache.set_many(missing, timeout=None)
+        generations.update(missing)
+
+    params = sorted(
+        (name, sorted(value.strip() for value in values))
+        for name, values in request.query_params.lists()
+    )
+    cache_key = f'{KEY_PREFIX}:page:{_digest([request.get_host(), [generations[key] for key in keys], params])}'
+    return cache_key, cache.get(cache_key)
+
+
+def store_page(cache_key, data):
+    if settings.RIDE_SEARCH_CACHE_TIMEOUT > 0:
+        cache.set(cache_key, data, timeout=settings.RIDE_SEARCH_CACHE_TIMEOUT)
+
+
+def invalidate_routes(*routes):
+    """Bump the generation of every search term matching one of the (origin, destination) routes"""
+    keys = set()
+    for origin, destination in routes:
+        keys.update(_route_generation_keys(normalize_place(origin), normalize_place(destination)))
+
+    def bump():
+        generation = uuid.uuid4().hex
+        cache.set_many({key: generation for key in keys}, timeout=None)
+
+    # Bump after commit so a concurrent read can't cache pre-write rows under the new generation
+    transaction.on_commit(bump)
+
+
+def invalidate_ride(ride):
+    invalidate_routes((ride.origin, ride.destination))
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, Tags, register
+
+
+@register(Tags.caches, deploy=True)
+def check_search_cache_shared(app_configs, **kwargs):
+    """
+    Cached search pages are invalidated through the default cache, so with
+    several server processes it must be shared between them
+    (manage.py check --deploy)
+    """
+    if settings.DEBUG or settings.RIDE_SEARCH_CACHE_TIMEOUT <= 0:
+        return []
+    if not isinstance(caches['default'], LocMemCache):
+        return []
+    return [Error(
+        'Ride search caching needs a cache shared by all server processes.',
+        hint=(
+            'The default cache is process-local, so invalidations would not reach '
+            'other workers. Set CACHE_BACKEND to '
+            'django.core.cache.backends.filebased.FileBasedCache with CACHE_LOCATION '
+            'a directory every worker can write (no Redis needed), or to '
+            'django.core.cache.backends.db.DatabaseCache after manage.py '
+            'createcachetable; or disable search caching with '
+            'RIDE_SEARCH_CACHE_TIMEOUT=0.'
+        ),
+        id='rides.E001',
+    )]
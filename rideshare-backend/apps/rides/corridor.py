@@ -0,0 +1,102 @@
+import math
+from .geo import EARTH_RADIUS_KM, cell_for, cells_within, haversine_km, ride_path
+from .models import Ride, RideRouteCell
+
+
+# Routes are rasterized by sampling a point at least every STEP_KM,
+# so any point on a route is within STEP_KM / 2 of a sampled cell.
+STEP_KM = 5.0
+
+DEFAULT_DETOUR_KM = 10.0
+MAX_DETOUR_KM = 50.0
+
+KM_PER_DEGREE = math.pi / 180 * EARTH_RADIUS_KM
+
+# Ride fields that define its path
+PATH_FIELDS = set(Ride.PATH_FIELDS)
+
+
+def path_cells(path):
+    """Grid cells touched by a path, sampled at most STEP_KM apart"""
+    cells = {cell_for(*point) for point in path}
+    for (lat1, lng1), (lat2, lng2) in zip(path, path[1:]):
+        steps = int(haversine_km(lat1, lng1, lat2, lng2) // STEP_KM) + 1
+        for i in range(1, steps):
+            t = i / steps
+            cells.add(cell_for(lat1 + (lat2 - lat1) * t, lng1 + (lng2 - lng1) * t))
+    return cells
+
+
+def index_route(ride, replace=True):
+    """Store the grid cells of a ride's path in RideRouteCell"""
+    path = ride_path(
+        ride.origin_lat, ride.origin_lng, ride.route,
+        ride.destination_lat, ride.destination_lng
+    )
+    if replace:
+        RideRouteCell.objects.filter(ride=ride).delete()
+    RideRouteCell.objects.bulk_create(
+        [RideRouteCell(ride=ride, cell=cell) for cell in path_cells(path)]
+    )
+
+
+def search_cells(lat, lng, detour_km):
+    """Cells that must contain a sample of any route passing within detour_km"""
+    return cells_within(lat, lng, detour_km + STEP_KM)
+
+
+def locate(path, lat, lng):
+    """
+    Return (distance_km, position_km) of the point on the path nearest
+    to (lat, lng): how far off the route it is, and how far along it.
+    Segments are projected onto a local plane around the point, which is
+    accurate at detour scale.
+    """
+    if len(path) == 1:
+        return haversine_km(lat, lng, *path[0]), 0.0
+    
+    scale_x = KM_PER_DEGREE * math.cos(math.radians(lat))
+    best = (math.inf, 0.0)
+    travelled = 0.0
+    
+    for (lat1, lng1), (lat2, lng2) in zip(path, path[1:]):
+        x1, y1 = (lng1 - lng) * scale_x, (lat1 - lat) * KM_PER_DEGREE
+        x2, y2 = (lng2 - lng) * scale_x, (lat2 - lat) * KM_PER_DEGREE
+        dx, dy = x2 - x1, y2 - y1
+        length_sq = dx * dx + dy * dy
+        t = 0.0 if not length_sq else max(0.0, min(1.0, -(x1 * dx + y1 * dy) / length_sq))
+        distance = math.hypot(x1 + t * dx, y1 + t * dy)
+        length = math.sqrt(length_sq)
+        if distance < best[0]:
+            best = (distance, travelled + t * length)
+        travelled += length
+    
+    return best
+
+
+def matching_ride_ids(queryset, pickup, dropoff, detour_km):
+    """
+    Ids of rides in queryset whose route passes within detour_km of the
+    pickup and then of the drop-off, in that order.
+    
+    Candidates come from the indexed route cells around both points;
+    only their paths are loaded and checked exactly.
+    """
+    candidates = queryset.filter(
+        route_cells__cell__in=search_cells(*pickup, detour_km)
+    ).filter(
+        route_cells__cell__in=search_cells(*dropoff, detour_km)
+    ).order_by().distinct().values_list(
+        'id', 'origin_lat', 'origin_lng', 'route', 'destination_lat', 'destination_lng'
+    )
+    
+    matched = []
+    for ride_id, *points in candidates:
+        path = ride_path(*points)
+        pickup_distance, pickup_position = locate(path, *pickup)
+        if pickup_distance > detour_km:
+            continue
+        dropoff_distance, dropoff_position = locate(path, *dropoff)
+        if dropoff_distance <= detour_km and pickup_position < dropoff_position:
+            matched.append(ride_id)
+    return matched
@@ -1,20 +1,76 @@
+import zoneinfo
+from datetime import datetime, time, timedelta
 import django_filters
+from django import forms
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.functions import TruncTime
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter, SearchFilter
+from .corridor import DEFAULT_DETOUR_KM, MAX_DETOUR_KM, matching_ride_ids
+from .geo import DEFAULT_RADIUS_KM, MAX_RADIUS_KM, filter_within
 from .models import Ride
+from .places import normalize_place
+from .ranking import relevance_expression
+
+
+MATCH_CHOICES = [
+    ('prefix', 'Starts with'),
+    ('exact', 'Exact'),
+    ('contains', 'Contains (slow, unindexed)'),
+]
+
+
+class TimeZoneField(forms.CharField):
+    """Form field turning an IANA name (e.g. 'Europe/Paris') into a ZoneInfo"""
+    
+    def to_python(self, value):
+        value = super().to_python(value)
+        if not value:
+            return None
+        try:
+            return zoneinfo.ZoneInfo(value)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            raise forms.ValidationError(f"Unknown time zone '{value}'")
+
+
+class TimeZoneFilter(django_filters.Filter):
+    field_class = TimeZoneField
+
+
+class RideFilterForm(forms.Form):
+    """Reject date parameters that can't be combined"""
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get('departure_date') and cleaned_data.get('departure_date_after'):
+            raise forms.ValidationError(
+                'Use either departure_date or departure_date_after, not both'
+            )
+        return cleaned_data
 
 
 class RideFilter(django_filters.FilterSet):
     """Filter for searching rides"""
     
-    origin = django_filters.CharFilter(lookup_expr='icontains')
-    destination = django_filters.CharFilter(lookup_expr='icontains')
-    departure_date = django_filters.DateFilter(
-        field_name='departure_time',
-        lookup_expr='date'
-    )
-    departure_date_after = django_filters.DateFilter(
-        field_name='departure_time',
-        lookup_expr='date__gte'
+    # Places match the normalized *_key columns by prefix (default) or
+    # exactly; ?match=contains opts into substring matching
+    origin = django_filters.CharFilter(method='filter_place')
+    destination = django_filters.CharFilter(method='filter_place')
+    match = django_filters.ChoiceFilter(
+        choices=MATCH_CHOICES, method='filter_in_queryset'
     )
+    
+    # Dates and time-of-day windows are interpreted in ?tz= (default: the
+    # active time zone) and applied as departure_time ranges in filter_queryset.
+    # A window with depart_before <= depart_after wraps past midnight.
+    departure_date = django_filters.DateFilter(method='filter_in_queryset')
+    departure_date_after = django_filters.DateFilter(method='filter_in_queryset')
+    depart_after = django_filters.TimeFilter(method='filter_in_queryset')
+    depart_before = django_filters.TimeFilter(method='filter_in_queryset')
+    tz = TimeZoneFilter(method='filter_in_queryset')
+    
     min_price = django_filters.NumberFilter(
         field_name='price',
         lookup_expr='gte'
@@ -27,11 +83,209 @@ class RideFilter(django_filters.FilterSet):
         field_name='seats_available',
         lookup_expr='gte'
     )
+    min_reputation = django_filters.NumberFilter(
+        field_name='driver__reputation',
+        lookup_expr='gte'
+    )
     instant_booking = django_filters.BooleanFilter()
     status = django_filters.ChoiceFilter(choices=Ride.STATUS_CHOICES)
     
+    # Proximity search: ?origin_lat=..&origin_lng=..&origin_radius=<km>
+    origin_lat = django_filters.NumberFilter(
+        method='filter_in_queryset', min_value=-90, max_value=90
+    )
+    origin_lng = django_filters.NumberFilter(
+        method='filter_in_queryset', min_value=-180, max_value=180
+    )
+    origin_radius = django_filters.NumberFilter(
+        method='filter_in_queryset', min_value=0, max_value=MAX_RADIUS_KM
+    )
+    destination_lat = django_filters.NumberFilter(
+        method='filter_in_queryset', min_value=-90, max_value=90
+    )
+    destination_lng = django_filters.NumberFilter(
+        method='filter_in_queryset', min_value=-180, max_value=180
+    )
+    destination_radius = django_filters.NumberFilter(
+        method='filter_in_queryset', min_value=0, max_value=MAX_RADIUS_KM
+    )
+    
+    # Corridor search: rides whose route passes the pickup, then the drop-off,
+    # within ?detour=<km>
+    pickup_lat = django_filters.NumberFilter(
+        method='filter_in_queryset', min_value=-90, max_value=90
+    )
+    pickup_lng = django_filters.NumberFilter(
+        method='filter_in_queryset', min_value=-180, max_value=180
+    )
+    dropoff_lat = django_filters.NumberFilter(
+        method='filter_in_queryset', min_value=-90, max_value=90
+    )
+    dropoff_lng = django_filters.NumberFilter(
+        method='filter_in_queryset', min_value=-180, max_value=180
+    )
+    detour = django_filters.NumberFilter(
+        method='filter_in_queryset', min_value=0, max_value=MAX_DETOUR_KM
+    )
+    
     class Meta:
         model = Ride
-        fields = ['origin', 'destination', 'departure_date', 
-                  'departure_date_after', 'min_price', 'max_price', 
-                  'min_seats', 'instant_booking', 'status']
\ No newline at end of file
+        form = RideFilterForm
+        fields = ['origin', 'destination', 'match', 'departure_date', 
+                  'departure_date_after', 'depart_after', 'depart_before',
+                  'tz', 'min_price', 'max_price', 
+                  'min_seats', 'min_reputation', 'instant_booking', 'status',
+                  'origin_lat', 'origin_lng', 'origin_radius',
+                  'destination_lat', 'destination_lng', 'destination_radius',
+                  'pickup_lat', 'pickup_lng', 'dropoff_lat', 'dropoff_lng', 'detour']
+    
+    def filter_place(self, queryset, name, value):
+        """Match a place on its indexed key, or by substring when opted in"""
+        mode = self.form.cleaned_data.get('match') or 'prefix'
+        if mode == 'contains':
+            return queryset.filter(**{f'{name}__icontains': value.strip()})
+        
+        lookup = 'exact' if mode == 'exact' else 'startswith'
+        return queryset.filter(**{f'{name}_key__{lookup}': normalize_place(value)})
+    
+    def filter_in_queryset(self, queryset, name, value):
+        """Schedule and coordinate filters are applied together in filter_queryset"""
+        return queryset
+    
+    def filter_queryset(self, queryset):
+        """Apply field filters, then the schedule, radius and corridor filters"""
+        queryset = super().filter_queryset(queryset)
+        data = self.form.cleaned_data
+        queryset = self.filter_schedule(queryset, data)
+        
+        for prefix in ('origin', 'destination'):
+            lat = data.get(f'{prefix}_lat')
+            lng = data.get(f'{prefix}_lng')
+            if lat is None or lng is None:
+                continue
+            radius = data.get(f'{prefix}_radius') or DEFAULT_RADIUS_KM
+            queryset = filter_within(
+                queryset, prefix, float(lat), float(lng), float(radius)
+            )
+        
+        pickup = (data.get('pickup_lat'), data.get('pickup_lng'))
+        dropoff = (data.get('dropoff_lat'), data.get('dropoff_lng'))
+        if None not in pickup + dropoff:
+            detour = data.get('detour') or DEFAULT_DETOUR_KM
+            ride_ids = matching_ride_ids(
+                queryset,
+                tuple(map(float, pickup)),
+                tuple(map(float, dropoff)),
+                float(detour)
+            )
+            queryset = queryset.filter(pk__in=ride_ids)
+        
+        return queryset
+    
+    def filter_schedule(self, queryset, data):
+        """
+        Apply date filters as half-open departure_time ranges so the
+        (status, departure_time) index can serve them
+        """
+        tz = data.get('tz') or timezone.get_current_timezone()
+        departure_date = data.get('departure_date')
+        after_date = data.get('departure_date_after')
+        window_start = data.get('depart_after')
+        window_end = data.get('depart_before')
+        
+        def local(day, at):
+            return timezone.make_aware(datetime.combine(day, at), tz)
+        
+        if departure_date:
+            # A single day narrows to [day + depart_after, day + depart_before),
+            # ending on the next day when the window wraps past midnight
+            start_time = window_start or time.min
+            next_day = departure_date + timedelta(days=1)
+            if not window_end:
+                end = local(next_day, time.min)
+            elif window_end <= start_time:
+                end = local(next_day, window_end)
+            else:
+                end = local(departure_date, window_end)
+            return queryset.filter(
+                departure_time__gte=local(departure_date, start_time),
+                departure_time__lt=end
+            )
+        
+        if after_date:
+            queryset = queryset.filter(departure_time__gte=local(after_date, time.min))
+        
+        # Time-of-day windows across many days refine the rows the range selected
+        if window_start or window_end:
+            queryset = queryset.alias(
+                local_departure_time=TruncTime('departure_time', tzinfo=tz)
+            )
+            after = Q(local_departure_time__gte=window_start) if window_start else Q()
+            before = Q(local_departure_time__lt=window_end) if window_end else Q()
+            if window_start and window_end and window_end <= window_start:
+                # e.g. 22:00-02:00: late evening or early morning
+                queryset = queryset.filter(after | before)
+            else:
+                queryset = queryset.filter(after & before)
+        
+        return queryset
+
+
+class PlaceSearchFilter(SearchFilter):
+    """
+    ?search= matched by prefix against the view's normalized search_fields
+    (e.g. '^origin_key'), with the whole query as a single term.
+    ?match=contains opts into substring search over contains_search_fields.
+    """
+    lookup_prefixes = {**SearchFilter.lookup_prefixes, '^': 'startswith'}
+    
+    def _contains(self, request):
+        return request.query_params.get('match') == 'contains'
+    
+    def get_search_fields(self, view, request):
+        if self._contains(request):
+            return getattr(view, 'contains_search_fields', None)
+        return super().get_search_fields(view, request)
+    
+    def get_search_terms(self, request):
+        if self._contains(request):
+            return super().get_search_terms(request)
+        term = normalize_place(request.query_params.get(self.search_param, ''))
+        return [term] if term else []
+
+
+class RelevanceOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter adding ?ordering=relevance: rides ranked best first by
+    the score of apps.rides.ranking around the requested departure
+    (?departure_date / ?departure_date_after + ?depart_after, or now).
+    Only the top RIDE_RELEVANCE_MAX_RESULTS are kept, so the database
+    sorts with a bounded ORDER BY ... LIMIT. Relevance can't be reversed or
+    combined with other fields (400).
+    """
+    relevance = 'relevance'
+    
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param, '')
+        fields = [param.strip() for param in params.split(',')]
+        if not {self.relevance, f'-{self.relevance}'} & set(fields):
+            return super().filter_queryset(request, queryset, view)
+        if fields != [self.relevance]:
+            raise ValidationError({
+                self.ordering_param: [f"'{self.relevance}' must be the only ordering and can't be reversed"]
+            })
+        
+        score = relevance_expression(self.requested_time(request, queryset))
+        return queryset.alias(relevance=score).order_by(
+            '-relevance', 'departure_time', 'id'
+        )[:settings.RIDE_RELEVANCE_MAX_RESULTS]
+    
+    def requested_time(self, request, queryset):
+        """Start of the searched departure window, or now without a date"""
+        filterset = RideFilter(request.query_params, queryset=queryset)
+        data = filterset.form.cleaned_data if filterset.is_valid() else {}
+        day = data.get('departure_date') or data.get('departure_date_after')
+        if not day:
+            return timezone.now()
+        tz = data.get('tz') or timezone.get_current_timezone()
+        return timezone.make_aware(datetime.combine(day, data.get('depart_after') or time.min), tz)
@@ -0,0 +1,116 @@
+import math
+from django.db.models import F, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+
+EARTH_RADIUS_KM = 6371.0
+
+# Fixed grid used for the indexed *_cell columns on Ride.
+# Changing it requires re-saving every ride with coordinates.
+CELL_DEGREES = 0.25
+GRID_ROWS = int(180 / CELL_DEGREES)
+GRID_COLS = int(360 / CELL_DEGREES)
+
+DEFAULT_RADIUS_KM = 25.0
+MAX_RADIUS_KM = 100.0
+
+
+def _row(lat):
+    return min(int((lat + 90.0) // CELL_DEGREES), GRID_ROWS - 1)
+
+
+def _col(lng):
+    return int((lng + 180.0) // CELL_DEGREES) % GRID_COLS
+
+
+def cell_for(lat, lng):
+    """Return the grid cell key containing a point, or None without coordinates"""
+    if lat is None or lng is None:
+        return None
+    return _row(lat) * GRID_COLS + _col(lng)
+
+
+def cells_within(lat, lng, radius_km):
+    """
+    Return the grid cell keys covering the bounding box of a circle.
+    Every point within radius_km of (lat, lng) lies in one of them.
+    """
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat = max(lat - lat_delta, -90.0)
+    max_lat = min(lat + lat_delta, 90.0)
+    
+    # Longitude degrees shrink towards the poles; widest at the box edge nearest a pole
+    widest = max(abs(min_lat), abs(max_lat))
+    if widest >= 89.0:
+        first_col, last_col = 0, GRID_COLS - 1
+    else:
+        lng_delta = lat_delta / math.cos(math.radians(widest))
+        if lng_delta >= 180.0:
+            first_col, last_col = 0, GRID_COLS - 1
+        else:
+            first_col = int((lng - lng_delta + 180.0) // CELL_DEGREES)
+            last_col = int((lng + lng_delta + 180.0) // CELL_DEGREES)
+    
+    cols = {col % GRID_COLS for col in range(first_col, last_col + 1)}
+    return [
+        row * GRID_COLS + col
+        for row in range(_row(min_lat), _row(max_lat) + 1)
+        for col in cols
+    ]
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance between two points in kilometers"""
+    dlat = math.radians(lat2 - lat1)
+    dlng = math.radians(lng2 - lng1)
+    a = (math.sin(dlat / 2) ** 2
+         + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2))
+         * math.sin(dlng / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def ride_path(origin_lat, origin_lng, route, destination_lat, destination_lng):
+    """Ordered points of a ride: origin, waypoints, destination (when known)"""
+    path = []
+    if origin_lat is not None and origin_lng is not None:
+        path.append((origin_lat, origin_lng))
+    path.extend((lat, lng) for lat, lng in route or [])
+    if destination_lat is not None and destination_lng is not None:
+        path.append((destination_lat, destination_lng))
+    return path
+
+
+def path_length_km(path):
+    """Length of a path of (lat, lng) points in kilometers, None without two points"""
+    if len(path) < 2:
+        return None
+    return sum(
+        haversine_km(lat1, lng1, lat2, lng2)
+        for (lat1, lng1), (lat2, lng2) in zip(path, path[1:])
+    )
+
+
+def distance_expression(lat_field, lng_field, lat, lng):
+    """Database expression for the haversine distance (km) from a point"""
+    dlat = Radians(F(lat_field) - Value(lat))
+    dlng = Radians(F(lng_field) - Value(lng))
+    a = (
+        Power(Sin(dlat / 2), 2)
+        + Value(math.cos(math.radians(lat))) * Cos(Radians(F(lat_field)))
+        * Power(Sin(dlng / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * ASin(Sqrt(a))
+
+
+def filter_within(queryset, prefix, lat, lng, radius_km):
+    """
+    Narrow a Ride queryset to rides whose <prefix> endpoint lies within
+    radius_km of (lat, lng): first by indexed grid cells, then by the
+    exact haversine distance
+    """
+    distance = f'{prefix}_distance'
+    return queryset.filter(
+        **{f'{prefix}_cell__in': cells_within(lat, lng, radius_km)}
+    ).alias(
+        **{distance: distance_expression(f'{prefix}_lat', f'{prefix}_lng', lat, lng)}
+    ).filter(**{f'{distance}__lte': radius_km})
@@ -0,0 +1,94 @@
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from apps.rides.models import Ride
+from apps.rides.serializers import RideListSerializer
+from apps.users.models import User
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    """
+    Compare RideListSerializer on model instances with its values() fast
+    path, checking both render the same JSON
+    
+    Usage: python manage.py benchmark_ride_list [--sizes 10 50 200] [--repeat 50]
+    
+    Sample rides are created inside a transaction that is rolled back when
+    the database holds fewer upcoming rides than the largest page size.
+    """
+    help = 'Benchmark ride list serialization: model instances vs values()'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 200])
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        sizes = options['sizes']
+        repeat = options['repeat']
+        try:
+            with transaction.atomic():
+                self._ensure_rides(max(sizes))
+                self._run(sizes, repeat)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _ensure_rides(self, count):
+        missing = count - Ride.objects.filter(status='upcoming').count()
+        if missing <= 0:
+            return
+        
+        driver = User.objects.create_user(
+            email='benchmark-driver@example.com',
+            username='benchmark-driver',
+            password=None,
+            first_name='Bench',
+            last_name='Mark'
+        )
+        start = timezone.now() + timedelta(days=1)
+        Ride.objects.bulk_create([
+            Ride(
+                driver=driver, origin='Boston', destination='New York',
+                departure_time=start + timedelta(minutes=i), price='25.00',
+                seats_available=i % 4, total_seats=4,
+                origin_key='boston', destination_key='new york'
+            )
+            for i in range(missing)
+        ])
+        self.stdout.write(f'Created {missing} sample rides (rolled back afterwards)')
+
+    def _run(self, sizes, repeat):
+        renderer = JSONRenderer()
+        context = {'request': RequestFactory().get('/api/rides/search/')}
+        base = Ride.objects.filter(status='upcoming').order_by('departure_time', 'id')
+        
+        def instances(size):
+            page = list(base.select_related('driver', 'preferences')[:size])
+            return renderer.render(RideListSerializer(page, many=True, context=context).data)
+        
+        def values(size):
+            page = list(RideListSerializer.values_queryset(base)[:size])
+            return renderer.render(RideListSerializer.represent_values(page, context))
+        
+        self.stdout.write(f'{"page size":>10} {"instances/s":>12} {"values/s":>12} {"speedup":>8}')
+        for size in sizes:
+            if instances(size) != values(size):
+                raise CommandError(f'Fast path output differs at page size {size}')
+            
+            timings = []
+            for build in (instances, values):
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    build(size)
+                timings.append(time.perf_counter() - started)
+            
+            slow, fast = (repeat / t for t in timings)
+            self.stdout.write(f'{size:>10} {slow:>12.1f} {fast:>12.1f} {fast / slow:>7.2f}x')
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.rides.corridor import index_route
+from apps.rides.models import Ride
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the RideRouteCell corridor index for upcoming rides
+    (or all rides with --all)
+    
+    Usage: python manage.py rebuild_route_cells [--all]
+    """
+    help = 'Recompute the route grid cells used by corridor search'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Include rides that are no longer upcoming'
+        )
+
+    def handle(self, *args, **options):
+        rides = Ride.objects.only(
+            'id', 'origin_lat', 'origin_lng', 'route',
+            'destination_lat', 'destination_lng'
+        )
+        if not options['all']:
+            rides = rides.filter(status='upcoming')
+        
+        count = 0
+        for ride in rides.iterator(chunk_size=500):
+            with transaction.atomic():
+                index_route(ride)
+            count += 1
+        
+        self.stdout.write(self.style.SUCCESS(f'Indexed routes for {count} rides'))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0004_ride_coordinates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='ride',
+            name='rides_ride_status_b1560e_idx',
+        ),
+        migrations.AddIndex(
+            model_name='ride',
+            index=models.Index(fields=['status', 'departure_time'], name='rides_ride_status_f25afd_idx'),
+        ),
+    ]
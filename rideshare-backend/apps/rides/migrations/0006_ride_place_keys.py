@@ -0,0 +1,54 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.rides.places import normalize_place
+
+
+def backfill_place_keys(apps, schema_editor):
+    Ride = apps.get_model('rides', 'Ride')
+    batch = []
+    for ride in Ride.objects.only('origin', 'destination').iterator(chunk_size=1000):
+        ride.origin_key = normalize_place(ride.origin)
+        ride.destination_key = normalize_place(ride.destination)
+        batch.append(ride)
+        if len(batch) == 1000:
+            Ride.objects.bulk_update(batch, ['origin_key', 'destination_key'])
+            batch = []
+    if batch:
+        Ride.objects.bulk_update(batch, ['origin_key', 'destination_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0005_status_departure_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='ride',
+            name='rides_ride_origin_16a44a_idx',
+        ),
+        migrations.AddField(
+            model_name='ride',
+            name='destination_key',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='ride',
+            name='origin_key',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_place_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='ride',
+            index=models.Index(fields=['origin_key', 'destination_key'], name='rides_route_key_idx', opclasses=['varchar_pattern_ops', 'varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='ride',
+            index=models.Index(fields=['destination_key'], name='rides_destination_key_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
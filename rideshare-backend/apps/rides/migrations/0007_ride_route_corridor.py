@@ -0,0 +1,31 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0006_ride_place_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ride',
+            name='route',
+            field=models.JSONField(blank=True, default=list, help_text='Ordered [lat, lng] waypoints between origin and destination'),
+        ),
+        migrations.CreateModel(
+            name='RideRouteCell',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cell', models.IntegerField()),
+                ('ride', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='route_cells', to='rides.ride')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['cell', 'ride'], name='rides_rider_cell_126cb6_idx')],
+                'unique_together': {('ride', 'cell')},
+            },
+        ),
+    ]
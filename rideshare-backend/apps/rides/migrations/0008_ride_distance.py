@@ -0,0 +1,36 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:39
+
+from django.db import migrations, models
+
+from apps.rides.geo import path_length_km, ride_path
+
+PATH_FIELDS = ('origin_lat', 'origin_lng', 'route', 'destination_lat', 'destination_lng')
+
+
+def backfill_distances(apps, schema_editor):
+    Ride = apps.get_model('rides', 'Ride')
+    batch = []
+    for ride in Ride.objects.only(*PATH_FIELDS).iterator(chunk_size=1000):
+        ride.distance = path_length_km(ride_path(*(getattr(ride, field) for field in PATH_FIELDS)))
+        batch.append(ride)
+        if len(batch) == 1000:
+            Ride.objects.bulk_update(batch, ['distance'])
+            batch = []
+    if batch:
+        Ride.objects.bulk_update(batch, ['distance'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0007_ride_route_corridor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ride',
+            name='distance',
+            field=models.FloatField(blank=True, editable=False, help_text='Length of the route in kilometers, when its ends are known', null=True),
+        ),
+        migrations.RunPython(backfill_distances, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,9 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.core.validators import MinValueValidator, MaxValueValidator
 from apps.core.models import TimeStampedModel
+from .geo import cell_for, path_length_km, ride_path
+from .places import normalize_place
 
 
 class Ride(TimeStampedModel):
@@ -13,6 +16,9 @@ class Ride(TimeStampedModel):
         ('cancelled', 'Cancelled'),
     ]
     
+    # Fields that define the ride's path (see apps.rides.corridor)
+    PATH_FIELDS = ('origin_lat', 'origin_lng', 'route', 'destination_lat', 'destination_lng')
+    
     # Driver
     driver = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -26,6 +32,38 @@ class Ride(TimeStampedModel):
     destination = models.CharField(max_length=255)
     destination_address = models.CharField(max_length=500, blank=True)
     
+    # Normalized origin/destination for indexed exact and prefix search
+    origin_key = models.CharField(max_length=255, editable=False, default='')
+    destination_key = models.CharField(max_length=255, editable=False, default='')
+    
+    # Coordinates, with grid cell keys maintained on save (see geo.py)
+    origin_lat = models.FloatField(
+        null=True, blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)]
+    )
+    origin_lng = models.FloatField(
+        null=True, blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)]
+    )
+    origin_cell = models.IntegerField(null=True, blank=True, editable=False)
+    destination_lat = models.FloatField(
+        null=True, blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)]
+    )
+    destination_lng = models.FloatField(
+        null=True, blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)]
+    )
+    destination_cell = models.IntegerField(null=True, blank=True, editable=False)
+    route = models.JSONField(
+        default=list, blank=True,
+        help_text='Ordered [lat, lng] waypoints between origin and destination'
+    )
+    distance = models.FloatField(
+        null=True, blank=True, editable=False,
+        help_text='Length of the route in kilometers, when its ends are known'
+    )
+    
     # Schedule
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField(null=True, blank=True)
@@ -47,14 +85,76 @@ class Ride(TimeStampedModel):
     class Meta:
         ordering = ['-departure_time']
         indexes = [
-            models.Index(fields=['origin', 'destination']),
+            models.Index(
+                fields=['origin_key', 'destination_key'],
+                name='rides_route_key_idx',
+                opclasses=['varchar_pattern_ops', 'varchar_pattern_ops']
+            ),
+            models.Index(
+                fields=['destination_key'],
+                name='rides_destination_key_idx',
+                opclasses=['varchar_pattern_ops']
+            ),
             models.Index(fields=['departure_time']),
-            models.Index(fields=['status']),
+            models.Index(fields=['status', 'departure_time']),
+            models.Index(fields=['driver', 'status']),
+            models.Index(fields=['origin_cell']),
+            models.Index(fields=['destination_cell']),
         ]
     
+    def __init__(self, *args, **kwargs):
+        """Store original route, path, status and departure for change detection"""
+        super().__init__(*args, **kwargs)
+        deferred = self.get_deferred_fields() if self.pk else set()
+        route_loaded = self.pk and not {'origin', 'destination'} & deferred
+        self._original_route = (self.origin, self.destination) if route_loaded else None
+        self._original_status = self.status if self.pk and 'status' not in deferred else None
+        path_loaded = self.pk and not set(self.PATH_FIELDS) & deferred
+        self._original_path = self.path_values() if path_loaded else None
+        self._original_departure_time = (
+            self.departure_time if self.pk and 'departure_time' not in deferred else None
+        )
+    
     def __str__(self):
         return f"{self.origin} → {self.destination} ({self.departure_time.date()})"
     
+    def path_values(self):
+        return tuple(getattr(self, field) for field in self.PATH_FIELDS)
+    
+    def save(self, *args, **kwargs):
+        """
+        Keep place keys, grid cell keys and the route distance in sync with
+        their sources. Saves are atomic so the post_save trip statistics
+        commit or roll back with the ride.
+        """
+        self.origin_key = normalize_place(self.origin)
+        self.destination_key = normalize_place(self.destination)
+        self.origin_cell = cell_for(self.origin_lat, self.origin_lng)
+        self.destination_cell = cell_for(self.destination_lat, self.destination_lng)
+        self.distance = path_length_km(ride_path(
+            self.origin_lat, self.origin_lng, self.route,
+            self.destination_lat, self.destination_lng
+        ))
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'origin' in update_fields:
+                update_fields.add('origin_key')
+            if 'destination' in update_fields:
+                update_fields.add('destination_key')
+            if update_fields & {'origin_lat', 'origin_lng'}:
+                update_fields.add('origin_cell')
+            if update_fields & {'destination_lat', 'destination_lng'}:
+                update_fields.add('destination_cell')
+            if update_fields & {'origin_lat', 'origin_lng', 'route',
+                                'destination_lat', 'destination_lng'}:
+                update_fields.add('distance')
+            kwargs['update_fields'] = update_fields
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+    
     @property
     def seats_booked(self):
         """Calculate number of seats already booked"""
@@ -66,6 +166,26 @@ class Ride(TimeStampedModel):
         return self.seats_available == 0
 
 
+class RideRouteCell(models.Model):
+    """Grid cell a ride's route passes through, for corridor matching"""
+    
+    ride = models.ForeignKey(
+        Ride,
+        on_delete=models.CASCADE,
+        related_name='route_cells'
+    )
+    cell = models.IntegerField()
+    
+    class Meta:
+        unique_together = ['ride', 'cell']
+        indexes = [
+            models.Index(fields=['cell', 'ride']),
+        ]
+    
+    def __str__(self):
+        return f"Cell {self.cell} of {self.ride}"
+
+
 class Car(models.Model):
     """Car information for rides"""
     
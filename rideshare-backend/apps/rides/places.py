@@ -0,0 +1,101 @@
+import unicodedata
+
+
+def normalize_place(value):
+    """
+    Normalize a place name for indexed matching: strip accents,
+    case-fold and collapse whitespace ('  São  Paulo' -> 'sao paulo')
+    """
+    value = unicodedata.normalize('NFKD', value or '')
+    value = ''.join(char for char in value if not unicodedata.combining(char))
+    return ' '.join(value.casefold().split())
+
+
+class _Node:
+    __slots__ = ('children', 'places', 'top')
+    
+    def __init__(self):
+        self.children = {}
+        self.places = set()   # place keys ending exactly at this node
+        self.top = []         # cached best place keys in this subtree, or None when stale
+
+
+class PlaceIndex:
+    """
+    In-process prefix trie of place names, ranked by how many upcoming
+    rides start or end there.
+    
+    Every node caches the top TOP_K keys of its subtree, so a lookup is
+    a walk down the prefix plus a slice. Increments update the caches
+    along the path in place; a decrement that touches a cached entry
+    marks the node stale and it is refilled from its subtree on the
+    next lookup. The whole index is rebuilt from the database after
+    REBUILD_SECONDS, which also drops rides that have since departed
+    and picks up writes made by other worker processes.
+    """
+    TOP_K = 10
+    REBUILD_SECONDS = 600
+    
+    def __init__(self):
+        self.root = _Node()
+        self.counts = {}
+        self.labels = {}
+        self.built_at = None
+    
+    def _path(self, key):
+        node = self.root
+        yield node
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+            yield node
+    
+    def _rank(self, key):
+        return (-self.counts.get(key, 0), key)
+    
+    def add(self, label, delta):
+        """Adjust the ride count of a place by delta (+1/-1)"""
+        key = normalize_place(label)
+        if not key:
+            return
+        count = self.counts.get(key, 0) + delta
+        if count > 0:
+            self.counts[key] = count
+            self.labels.setdefault(key, ' '.join(label.split()))
+        else:
+            self.counts.pop(key, None)
+            self.labels.pop(key, None)
+        
+        for node in self._path(key):
+            if node.top is None:
+                continue
+            if delta < 0 and key in node.top:
+                node.top = None
+            elif delta > 0 and (key in node.top or len(node.top) < self.TOP_K
+                                or self._rank(key) < self._rank(node.top[-1])):
+                top = [entry for entry in node.top if entry != key] + [key]
+                node.top = sorted(top, key=self._rank)[:self.TOP_K]
+        
+        if count > 0:
+            node.places.add(key)
+        else:
+            node.places.discard(key)
+    
+    def _refill(self, node):
+        found = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            found.extend(current.places)
+            stack.extend(current.children.values())
+        node.top = sorted(found, key=self._rank)[:self.TOP_K]
+    
+    def search(self, prefix, limit=TOP_K):
+        """Return [(label, ride_count)] for the best places starting with prefix"""
+        node = self.root
+        for char in normalize_place(prefix):
+            node = node.children.get(char)
+            if node is None:
+                return []
+        if node.top is None:
+            self._refill(node)
+        return [(self.labels[key], self.counts[key]) for key in node.top[:limit]]
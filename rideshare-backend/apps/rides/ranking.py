@@ -0,0 +1,60 @@
+"""
+Relevance score for ride search (?ordering=relevance), computed by the
+database from columns stored on the ride and its driver. Each signal is
+scaled to 0..1 and weighted by RIDE_RELEVANCE_WEIGHTS:
+
+- time: closeness of departure_time to the requested time
+- price: cheaper is better
+- seats: share of seats still free
+- instant: instant booking available
+- reputation: the driver's stored Bayesian reputation (1-5 stars)
+"""
+from django.conf import settings
+from django.db.models import Case, F, FloatField, Func, Value, When
+from django.db.models.functions import Abs, Cast, Greatest
+
+
+class EpochSeconds(Func):
+    """Seconds since the Unix epoch of a datetime column"""
+    output_field = FloatField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template='EXTRACT(EPOCH FROM %(expressions)s)', **extra_context)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template="(julianday(%(expressions)s) - 2440587.5) * 86400.0", **extra_context)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template='UNIX_TIMESTAMP(%(expressions)s)', **extra_context)
+
+
+def relevance_expression(requested_time):
+    """Weighted relevance score of a ride for a search around requested_time"""
+    weights = settings.RIDE_RELEVANCE_WEIGHTS
+    time_scale = float(settings.RIDE_RELEVANCE_TIME_SCALE_HOURS) * 3600.0
+    price_scale = float(settings.RIDE_RELEVANCE_PRICE_SCALE)
+
+    # 1 at the requested time, 1/2 one time scale away, ...
+    seconds_away = Abs(EpochSeconds('departure_time') - Value(requested_time.timestamp()))
+    time_score = Value(time_scale) / (Value(time_scale) + seconds_away)
+
+    # 1 when free, 1/2 at price_scale, ...
+    price_score = Value(price_scale) / (Value(price_scale) + Cast('price', FloatField()))
+
+    seats_score = Cast('seats_available', FloatField()) / Greatest(
+        Cast('total_seats', FloatField()), Value(1.0)
+    )
+    instant_score = Case(
+        When(instant_booking=True, then=Value(1.0)),
+        default=Value(0.0),
+        output_field=FloatField()
+    )
+    reputation_score = (F('driver__reputation') - Value(1.0)) / Value(4.0)
+
+    return (
+        Value(float(weights['time'])) * time_score
+        + Value(float(weights['price'])) * price_score
+        + Value(float(weights['seats'])) * seats_score
+        + Value(float(weights['instant'])) * instant_score
+        + Value(float(weights['reputation'])) * reputation_score
+    )
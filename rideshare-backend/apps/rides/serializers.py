@@ -1,14 +1,23 @@
+from django.db import transaction
 from rest_framework import serializers
+from rest_framework.settings import api_settings
+from apps.core.serializers import ThumbnailsField
 from .models import Ride, Car, RidePreferences
+from apps.bookings.services import cancel_ride
 from apps.users.serializers import UserPublicSerializer
 
 
+MAX_ROUTE_POINTS = 100
+
+
 class CarSerializer(serializers.ModelSerializer):
     """Serializer for Car model"""
+    car_image_thumbnails = ThumbnailsField(source='car_image')
     
     class Meta:
         model = Car
-        fields = ('id', 'make', 'model', 'color', 'year', 'license_plate', 'car_image')
+        fields = ('id', 'make', 'model', 'color', 'year', 'license_plate', 'car_image',
+                  'car_image_thumbnails')
         read_only_fields = ('id',)
 
 
@@ -20,6 +29,33 @@ class RidePreferencesSerializer(serializers.ModelSerializer):
         fields = ('smoking_allowed', 'pets_allowed', 'music_allowed', 'chat_allowed')
 
 
+def validate_coordinate_pairs(data):
+    """Latitude and longitude of an endpoint must be given together"""
+    for prefix in ('origin', 'destination'):
+        has_lat = data.get(f'{prefix}_lat') is not None
+        has_lng = data.get(f'{prefix}_lng') is not None
+        if has_lat != has_lng:
+            raise serializers.ValidationError(
+                f"Both {prefix}_lat and {prefix}_lng are required"
+            )
+
+
+def validate_route_points(value):
+    """Route waypoints: a list of [lat, lng] pairs"""
+    if len(value) > MAX_ROUTE_POINTS:
+        raise serializers.ValidationError(
+            f"A route can have at most {MAX_ROUTE_POINTS} waypoints"
+        )
+    for point in value:
+        if (not isinstance(point, (list, tuple)) or len(point) != 2
+                or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in point)
+                or not -90 <= point[0] <= 90 or not -180 <= point[1] <= 180):
+            raise serializers.ValidationError(
+                "Each waypoint must be a [lat, lng] pair"
+            )
+    return [[float(lat), float(lng)] for lat, lng in value]
+
+
 class RideListSerializer(serializers.ModelSerializer):
     """Serializer for listing rides (compact view)"""
     driver = UserPublicSerializer(read_only=True)
@@ -31,6 +67,85 @@ class RideListSerializer(serializers.ModelSerializer):
         fields = ('id', 'driver', 'origin', 'destination', 'departure_time', 
                   'price', 'seats_available', 'total_seats', 'seats_booked', 
                   'is_full', 'status', 'instant_booking')
+    
+    # Columns read by the values() fast path (see represent_values)
+    values_fields = (
+        'id', 'origin', 'destination', 'departure_time', 'price',
+        'seats_available', 'total_seats', 'status', 'instant_booking',
+        'driver__id', 'driver__username', 'driver__first_name',
+        'driver__last_name', 'driver__avatar', 'driver__rating_average',
+        'driver__rating_count', 'driver__reputation', 'driver__rides_given',
+        'driver__is_verified',
+        'driver__email', 'driver__phone_number',
+    )
+    
+    @classmethod
+    def values_queryset(cls, queryset):
+        """Only the listed columns, driver joined in the same query, as dicts"""
+        return queryset.values(*cls.values_fields)
+    
+    @classmethod
+    def represent_values(cls, rows, context=None):
+        """
+        Build the output of many=True straight from values_queryset() rows,
+        without model instances or nested serializers. The JSON is identical
+        to the regular path: fields that need formatting reuse this
+        serializer's own fields, the rest mirror the model properties.
+        """
+        fields = cls(context=context or {}).fields
+        departure_time = fields['departure_time'].to_representation
+        price = fields['price'].to_representation
+        avatar_use_url = getattr(
+            fields['driver'].fields['avatar'], 'use_url',
+            api_settings.UPLOADED_FILES_USE_URL
+        )
+        avatar_thumbnails = fields['driver'].fields['avatar_thumbnails'].to_representation
+        reputation = fields['driver'].fields['reputation'].to_representation
+        driver_model = Ride._meta.get_field('driver').related_model
+        avatar_field = driver_model._meta.get_field('avatar')
+        avatar_storage = avatar_field.storage
+        request = (context or {}).get('request')
+        
+        def avatar(name):
+            if not name:
+                return None
+            if not avatar_use_url:
+                return name
+            url = avatar_storage.url(name)
+            return request.build_absolute_uri(url) if request is not None else url
+        
+        return [
+            {
+                'id': row['id'],
+                'driver': {
+                    'id': row['driver__id'],
+                    'username': row['driver__username'],
+                    'full_name': f"{row['driver__first_name']} {row['driver__last_name']}".strip(),
+                    'avatar': avatar(row['driver__avatar']),
+                    'avatar_thumbnails': avatar_thumbnails(
+                        avatar_field.attr_class(None, avatar_field, row['driver__avatar'])
+                    ),
+                    'rating': round(row['driver__rating_average'], 1),
+                    'reviews_count': row['driver__rating_count'],
+                    'reputation': reputation(row['driver__reputation']),
+                    'rides_given': row['driver__rides_given'],
+                    'is_verified': row['driver__is_verified'],
+                    'email': row['driver__email'],
+                    'phone_number': row['driver__phone_number'],
+                },
+                'origin': row['origin'],
+                'destination': row['destination'],
+                'departure_time': departure_time(row['departure_time']),
+                'price': price(row['price']),
+                'seats_available': row['seats_available'],
+                'total_seats': row['total_seats'],
+                'seats_booked': row['total_seats'] - row['seats_available'],
+                'is_full': row['seats_available'] == 0,
+                'status': row['status'],
+                'instant_booking': row['instant_booking'],
+            }
+            for row in rows
+        ]
 
 
 class RideDetailSerializer(serializers.ModelSerializer):
@@ -43,8 +158,9 @@ class RideDetailSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Ride
-        fields = ('id', 'driver', 'origin', 'origin_address', 'destination', 
-                  'destination_address', 'departure_time', 'arrival_time', 
+        fields = ('id', 'driver', 'origin', 'origin_address', 'origin_lat',
+                  'origin_lng', 'destination', 'destination_address',
+                  'destination_lat', 'destination_lng', 'route', 'departure_time', 'arrival_time', 
                   'price', 'seats_available', 'total_seats', 'seats_booked',
                   'is_full', 'description', 'status', 'instant_booking', 
                   'preferences', 'car', 'created_at', 'updated_at')
@@ -63,9 +179,11 @@ class RideCreateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Ride
-        fields = ('origin', 'origin_address', 'destination', 'destination_address',
-                  'departure_time', 'arrival_time', 'price', 'seats_available',
-                  'total_seats', 'description', 'instant_booking', 'preferences')
+        fields = ('origin', 'origin_address', 'origin_lat', 'origin_lng',
+                  'destination', 'destination_address', 'destination_lat',
+                  'destination_lng', 'route', 'departure_time', 'arrival_time',
+                  'price', 'seats_available', 'total_seats', 'description',
+                  'instant_booking', 'preferences')
     
     def validate(self, data):
         """Validate ride data"""
@@ -84,8 +202,13 @@ class RideCreateSerializer(serializers.ModelSerializer):
                 "Price cannot be negative"
             )
         
+        validate_coordinate_pairs(data)
+        
         return data
     
+    def validate_route(self, value):
+        return validate_route_points(value)
+    
     def create(self, validated_data):
         """Create ride with preferences"""
         preferences_data = validated_data.pop('preferences', None)
@@ -111,26 +234,52 @@ class RideUpdateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Ride
-        fields = ('origin', 'origin_address', 'destination', 'destination_address',
-                  'departure_time', 'arrival_time', 'price', 'seats_available',
-                  'description', 'instant_booking', 'status', 'preferences')
+        fields = ('origin', 'origin_address', 'origin_lat', 'origin_lng',
+                  'destination', 'destination_address', 'destination_lat',
+                  'destination_lng', 'route', 'departure_time', 'arrival_time',
+                  'price', 'seats_available', 'description', 'instant_booking', 'status',
+                  'preferences')
+    
+    def validate(self, data):
+        """Validate coordinates against the values already stored"""
+        merged = {
+            field: data.get(field, getattr(self.instance, field, None))
+            for field in ('origin_lat', 'origin_lng', 'destination_lat', 'destination_lng')
+        }
+        validate_coordinate_pairs(merged)
+        return data
+    
+    def validate_route(self, value):
+        return validate_route_points(value)
     
     def update(self, instance, validated_data):
-        """Update ride and preferences"""
+        """Update ride, preferences and a cancellation in one transaction"""
         preferences_data = validated_data.pop('preferences', None)
         
-        # Update ride fields
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
+        # Cancelling goes through the booking/notification fanout
+        cancelling = (
+            validated_data.get('status') == 'cancelled'
+            and instance.status != 'cancelled'
+        )
+        if cancelling:
+            validated_data.pop('status')
         
-        # Update preferences if provided
-        if preferences_data:
-            if hasattr(instance, 'preferences'):
-                for attr, value in preferences_data.items():
-                    setattr(instance.preferences, attr, value)
-                instance.preferences.save()
-            else:
-                RidePreferences.objects.create(ride=instance, **preferences_data)
+        with transaction.atomic():
+            # Update ride fields
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save()
+            
+            # Update preferences if provided
+            if preferences_data:
+                if hasattr(instance, 'preferences'):
+                    for attr, value in preferences_data.items():
+                        setattr(instance.preferences, attr, value)
+                    instance.preferences.save()
+                else:
+                    RidePreferences.objects.create(ride=instance, **preferences_data)
+            
+            if cancelling:
+                cancel_ride(instance)
         
         return instance
\ No newline at end of file
@@ -0,0 +1,71 @@
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from apps.core import images
+from apps.users import stats
+from . import autocomplete, corridor
+from .cache import invalidate_routes
+from .models import Car, Ride
+
+
+def _listed_places(status, departure_time, route):
+    """Places a ride contributes to autocomplete while it is upcoming and not yet departed"""
+    if status != 'upcoming' or route is None or departure_time is None:
+        return ()
+    return route if departure_time >= timezone.now() else ()
+
+
+@receiver(post_save, sender=Ride)
+def ride_saved(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Drop cached searches that could include this ride, under both its
+    current and its previous route, update the place and route indexes and
+    count a status change to or from completed in trip statistics
+    """
+    path_saved = update_fields is None or corridor.PATH_FIELDS & update_fields
+    if created or (path_saved and instance.path_values() != instance._original_path):
+        corridor.index_route(instance, replace=not created)
+    instance._original_path = instance.path_values()
+    
+    route = (instance.origin, instance.destination)
+    routes = [route]
+    if instance._original_route is not None:
+        routes.append(instance._original_route)
+    invalidate_routes(*routes)
+    
+    old_places = () if created else _listed_places(
+        instance._original_status, instance._original_departure_time, instance._original_route
+    )
+    new_places = _listed_places(instance.status, instance.departure_time, route)
+    if old_places != new_places:
+        autocomplete.record_ride_change(old_places, new_places)
+    
+    if created or instance._original_status is not None:
+        stats.ride_status_changed(instance, instance._original_status)
+    
+    instance._original_route = route
+    instance._original_status = instance.status
+    instance._original_departure_time = instance.departure_time
+
+
+@receiver(post_delete, sender=Ride)
+def ride_deleted(sender, instance, **kwargs):
+    invalidate_routes((instance.origin, instance.destination))
+    autocomplete.record_ride_change(
+        _listed_places(
+            instance.status, instance.departure_time, (instance.origin, instance.destination)
+        ), ()
+    )
+
+
+@receiver(pre_save, sender=Car)
+def track_car_image_upload(sender, instance, **kwargs):
+    instance._pending_images = images.pending_uploads(instance, ['car_image'])
+
+
+@receiver(post_save, sender=Car)
+def process_car_image_upload(sender, instance, **kwargs):
+    """Strip metadata and make fitted thumbnails of a new car photo"""
+    if getattr(instance, '_pending_images', None):
+        images.schedule(instance.car_image, crop=False)
+        instance._pending_images = []
@@ -1,3 +1,88 @@
+import base64
+import json
+from datetime import timedelta
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.users.models import User
+from .models import Ride
 
-# Create your tests here.
+
+class RelevanceOrderingTests(TestCase):
+    """?ordering=relevance on ride search"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        driver = User.objects.create_user(email='driver@example.com', username='driver', password='pw')
+        now = timezone.now()
+        self.soon, self.later = [
+            Ride.objects.create(
+                driver=driver, origin='Boston', destination='New York',
+                departure_time=now + delay, price=20, seats_available=3, total_seats=3
+            )
+            for delay in (timedelta(hours=2), timedelta(days=5))
+        ]
+
+    def search(self, ordering):
+        return self.client.get('/api/rides/search/', {'ordering': ordering})
+
+    def test_ranks_closest_departure_first(self):
+        response = self.search('relevance')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [ride['id'] for ride in response.data['results']],
+            [self.soon.id, self.later.id]
+        )
+
+    def test_reversed_or_combined_relevance_is_rejected(self):
+        for ordering in ('-relevance', 'relevance,price', 'price,relevance'):
+            with self.subTest(ordering=ordering):
+                self.assertEqual(self.search(ordering).status_code, 400)
+
+    def test_other_orderings_still_apply(self):
+        response = self.search('-departure_time')
+        self.assertEqual(
+            [ride['id'] for ride in response.data['results']],
+            [self.later.id, self.soon.id]
+        )
+
+
+class KeysetCursorTests(TestCase):
+    """?cursor= tokens on the ride list"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        driver = User.objects.create_user(email='driver@example.com', username='driver', password='pw')
+        Ride.objects.create(
+            driver=driver, origin='Boston', destination='New York',
+            departure_time=timezone.now() + timedelta(days=1),
+            price=20, seats_available=3, total_seats=3
+        )
+
+    def get(self, position):
+        token = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+        return self.client.get('/api/rides/', {'cursor': token})
+
+    def test_valid_cursor_returns_page(self):
+        # Rides are listed latest departure first
+        response = self.get({'v': (timezone.now() + timedelta(days=2)).isoformat(), 'id': 0, 'r': 0})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_malformed_cursor_is_not_found(self):
+        departure = timezone.now().isoformat()
+        for position in (
+            {'v': None, 'id': 1, 'r': 0},
+            {'v': {}, 'id': 1, 'r': 0},
+            {'v': [], 'id': 1, 'r': 0},
+            {'v': 'not a date', 'id': 1, 'r': 0},
+            {'v': departure, 'id': None, 'r': 0},
+            {'v': departure, 'id': 2 ** 70, 'r': 0},
+            {'v': departure, 'r': 0},
+            [departure, 1, 0],
+        ):
+            with self.subTest(position=position):
+                self.assertEqual(self.get(position).status_code, 404)
@@ -4,7 +4,8 @@ from .views import (
     RideDetailView,
     MyRidesView,
     SearchRidesView,
-    CarCreateUpdateView
+    CarCreateUpdateView,
+    place_autocomplete
 )
 
 app_name = 'rides'
@@ -14,5 +15,6 @@ urlpatterns = [
     path('search/', SearchRidesView.as_view(), name='ride-search'),
     path('my-rides/', MyRidesView.as_view(), name='my-rides'),
     path('car/', CarCreateUpdateView.as_view(), name='car'),
+    path('places/autocomplete/', place_autocomplete, name='place-autocomplete'),
     path('<int:pk>/', RideDetailView.as_view(), name='ride-detail'),
 ]
\ No newline at end of file
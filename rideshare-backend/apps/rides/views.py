@@ -1,8 +1,10 @@
 from rest_framework import generics, permissions, status
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
+from apps.bookings.services import cancel_ride
 from .models import Ride, Car
 from .serializers import (
     RideListSerializer,
@@ -11,7 +13,9 @@ from .serializers import (
     RideUpdateSerializer,
     CarSerializer
 )
-from .filters import RideFilter
+from .filters import RideFilter, PlaceSearchFilter, RelevanceOrderingFilter
+from . import autocomplete, cache as search_cache
+from .places import PlaceIndex
 
 
 class IsDriverOrReadOnly(permissions.BasePermission):
@@ -24,18 +28,44 @@ class IsDriverOrReadOnly(permissions.BasePermission):
         return obj.driver == request.user
 
 
-class RideListCreateView(generics.ListCreateAPIView):
+class ValuesListMixin:
+    """
+    List rides through RideListSerializer's values() fast path: one query
+    for the needed columns, output dicts built directly, same JSON
+    """
+    
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        if not hasattr(serializer_class, 'represent_values'):
+            return super().list(request, *args, **kwargs)
+        
+        queryset = serializer_class.values_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else queryset
+        data = serializer_class.represent_values(rows, self.get_serializer_context())
+        
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class RideListCreateView(ValuesListMixin, generics.ListCreateAPIView):
     """
     GET /api/rides/ - List all rides with filters
+    (?pagination=cursor for keyset pages)
     POST /api/rides/ - Create a new ride
     """
     queryset = Ride.objects.select_related('driver', 'preferences').all()
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, PlaceSearchFilter, OrderingFilter]
     filterset_class = RideFilter
-    search_fields = ['origin', 'destination', 'description']
+    search_fields = ['^origin_key', '^destination_key']
+    contains_search_fields = ['origin', 'destination', 'description']
     ordering_fields = ['departure_time', 'price', 'created_at']
     ordering = ['-departure_time']
+    keyset_field = 'departure_time'
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -61,17 +91,16 @@ class RideDetailView(generics.RetrieveUpdateDestroyAPIView):
         return RideDetailSerializer
     
     def destroy(self, request, *args, **kwargs):
-        """Cancel ride instead of deleting"""
+        """Cancel ride instead of deleting, notifying its passengers"""
         ride = self.get_object()
-        ride.status = 'cancelled'
-        ride.save()
+        cancel_ride(ride)
         return Response(
             {'message': 'Ride cancelled successfully'},
             status=status.HTTP_200_OK
         )
 
 
-class MyRidesView(generics.ListAPIView):
+class MyRidesView(ValuesListMixin, generics.ListAPIView):
     """
     GET /api/rides/my-rides/ - Get current user's rides as driver
     """
@@ -84,22 +113,40 @@ class MyRidesView(generics.ListAPIView):
         ).select_related('driver', 'preferences')
 
 
-class SearchRidesView(generics.ListAPIView):
+class SearchRidesView(ValuesListMixin, generics.ListAPIView):
     """
     GET /api/rides/search/ - Search rides with query params
     ?origin=Boston&destination=NYC&date=2024-01-15&min_seats=2
+    (places match by prefix; &match=exact or &match=contains to change)
+    ?origin_lat=42.36&origin_lng=-71.06&origin_radius=20
+     &destination_lat=40.71&destination_lng=-74.01&destination_radius=10
+    ?min_reputation=4.2&ordering=-driver__reputation (best-rated drivers first)
+    ?ordering=relevance (best match first: time, price, seats, instant
+     booking and driver reputation; top RIDE_RELEVANCE_MAX_RESULTS only)
     """
     serializer_class = RideListSerializer
     permission_classes = [permissions.AllowAny]
-    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, RelevanceOrderingFilter]
     filterset_class = RideFilter
-    ordering_fields = ['departure_time', 'price']
+    ordering_fields = ['departure_time', 'price', 'driver__reputation']
     ordering = ['departure_time']
+    keyset_field = 'departure_time'
     
     def get_queryset(self):
         return Ride.objects.filter(
             status='upcoming'
         ).select_related('driver', 'preferences')
+    
+    def list(self, request, *args, **kwargs):
+        """Serve repeated searches from the result cache"""
+        cache_key, data = search_cache.get_cached_page(request)
+        if data is not None:
+            return Response(data)
+        
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            search_cache.store_page(cache_key, response.data)
+        return response
 
 
 class CarCreateUpdateView(generics.RetrieveUpdateAPIView):
@@ -113,4 +160,26 @@ class CarCreateUpdateView(generics.RetrieveUpdateAPIView):
     def get_object(self):
         """Get or create car for current user"""
         car, created = Car.objects.get_or_create(user=self.request.user)
-        return car
\ No newline at end of file
+        return car
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([permissions.AllowAny])
+def place_autocomplete(request):
+    """
+    GET /api/rides/places/autocomplete/?q=bos&limit=5
+    City suggestions ranked by upcoming rides, served from memory
+    """
+    try:
+        limit = int(request.query_params.get('limit', PlaceIndex.TOP_K))
+    except ValueError:
+        limit = PlaceIndex.TOP_K
+    limit = max(1, min(limit, PlaceIndex.TOP_K))
+    
+    suggestions = autocomplete.suggest(request.query_params.get('q', ''), limit)
+    
+    return Response(
+        {'results': [{'name': name, 'rides': rides} for name, rides in suggestions]},
+        status=status.HTTP_200_OK
+    )
\ No newline at end of file
@@ -1,10 +1,20 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.contrib.auth.forms import AdminPasswordChangeForm
 from .models import User
 
 
+class TokenRevokingPasswordChangeForm(AdminPasswordChangeForm):
+    """Admin password change that also revokes the user's tokens"""
+    
+    def save(self, commit=True):
+        self.user.token_version += 1
+        return super().save(commit=commit)
+
+
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
+    change_password_form = TokenRevokingPasswordChangeForm
     list_display = ('email', 'username', 'full_name', 'is_verified', 
                     'rides_given', 'rides_taken', 'rating', 'date_joined')
     list_filter = ('is_verified', 'is_staff', 'is_active', 'date_joined')
@@ -15,7 +25,8 @@ class UserAdmin(BaseUserAdmin):
         (None, {'fields': ('email', 'username', 'password')}),
         ('Personal Info', {'fields': ('first_name', 'last_name', 'avatar', 
                                       'bio', 'phone_number', 'location')}),
-        ('Statistics', {'fields': ('rides_given', 'rides_taken', 'total_distance')}),
+        ('Statistics', {'fields': ('rides_given', 'rides_taken', 'total_distance',
+                                   'total_earnings')}),
         ('Permissions', {'fields': ('is_active', 'is_staff', 'is_superuser', 
                                     'is_verified', 'groups', 'user_permissions')}),
         ('Important dates', {'fields': ('last_login', 'date_joined')}),
@@ -27,4 +38,7 @@ class UserAdmin(BaseUserAdmin):
             'fields': ('email', 'username', 'first_name', 'last_name', 
                       'password1', 'password2'),
         }),
-    )
\ No newline at end of file
+    )
+    
+    # Maintained from the earnings ledger
+    readonly_fields = ('total_earnings',)
@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from . import revocation
+from .models import User
+
+
+# Columns kept in the cache; every other field is loaded on first access
+CACHED_FIELDS = ('id', 'is_active', 'token_version')
+
+VERSION_CLAIM = 'ver'
+
+
+def cache_key(user_id):
+    return f'auth_user:{user_id}'
+
+
+class VersionedRefreshToken(RefreshToken):
+    """Refresh token (and its access tokens) carrying the user's token_version"""
+    
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[VERSION_CLAIM] = user.token_version
+        return token
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that reads the user's id, active flag and token
+    version from the cache (AUTH_USER_CACHE_TIMEOUT seconds) instead of
+    selecting the user row on every request.
+    
+    request.user is a real User with the other fields deferred; the first
+    access to one of them loads the rest in a single query. Revoked
+    tokens are refused without a query.
+    """
+    
+    def get_validated_token(self, raw_token):
+        """Reject revoked tokens (checked in memory, see revocation)"""
+        token = super().get_validated_token(raw_token)
+        if revocation.is_revoked(token):
+            raise InvalidToken(_('Token has been revoked'))
+        return token
+    
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+        
+        key = cache_key(user_id)
+        record = cache.get(key)
+        if record is None:
+            record = User.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).values_list(*CACHED_FIELDS).first()
+            if record is None:
+                raise AuthenticationFailed(_('User not found'), code='user_not_found')
+            cache.set(key, record, settings.AUTH_USER_CACHE_TIMEOUT)
+        
+        user = User.from_db('default', CACHED_FIELDS, record)
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        if validated_token.get(VERSION_CLAIM, 0) != user.token_version:
+            raise AuthenticationFailed(_('Token is no longer valid'), code='token_outdated')
+        
+        user._auth_cached = True
+        return user
+
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.users.models import TokenRevocation
+
+
+class Command(BaseCommand):
+    """
+    Delete token revocations whose tokens have expired anyway
+    
+    Usage: python manage.py prune_token_revocations (e.g. daily)
+    """
+    help = 'Remove expired rows from the token revocation table'
+
+    def handle(self, *args, **options):
+        deleted, _ = TokenRevocation.objects.filter(expires_at__lte=timezone.now()).delete()
+        self.stdout.write(self.style.SUCCESS(f'Removed {deleted} expired token revocations'))
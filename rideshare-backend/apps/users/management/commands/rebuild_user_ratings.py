@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce
+from apps.reviews.models import Review
+from apps.reviews.signals import reputation_expression
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the denormalized rating_sum / rating_count / rating_average,
+    star histogram and reputation columns on User from the reviews table
+    
+    Usage: python manage.py rebuild_user_ratings
+    """
+    help = 'Recompute stored user rating aggregates from reviews'
+
+    def handle(self, *args, **options):
+        received = Review.objects.filter(
+            reviewee=OuterRef('pk')
+        ).order_by().values('reviewee')
+        
+        rating_sum = received.annotate(total=Sum('rating')).values('total')
+        rating_count = received.annotate(total=Count('id')).values('total')
+        histogram = {
+            f'rating_{stars}_count': Coalesce(Subquery(
+                received.filter(rating=stars).annotate(total=Count('id')).values('total'),
+                output_field=IntegerField()
+            ), 0)
+            for stars in range(1, 6)
+        }
+        
+        with transaction.atomic():
+            updated = User.objects.update(
+                rating_sum=Coalesce(Subquery(rating_sum, output_field=IntegerField()), 0),
+                rating_count=Coalesce(Subquery(rating_count, output_field=IntegerField()), 0),
+                **histogram
+            )
+            User.objects.update(
+                rating_average=Case(
+                    When(rating_count=0, then=Value(0.0)),
+                    default=Cast(F('rating_sum'), FloatField()) / Cast(F('rating_count'), FloatField()),
+                    output_field=FloatField()
+                ),
+                reputation=reputation_expression(F('rating_sum'), F('rating_count'))
+            )
+        
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt ratings for {updated} users'))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, FloatField, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from apps.bookings.models import Booking
+from apps.rides.models import Ride
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the rides_given / rides_taken / total_distance columns on User
+    from completed rides and their accepted bookings, in one UPDATE
+    
+    Usage: python manage.py rebuild_user_stats
+    """
+    help = 'Recompute stored user trip statistics from rides and bookings'
+
+    def handle(self, *args, **options):
+        driven = Ride.objects.filter(
+            driver=OuterRef('pk'),
+            status='completed'
+        ).order_by().values('driver')
+        taken = Booking.objects.filter(
+            passenger=OuterRef('pk'),
+            status='accepted',
+            ride__status='completed'
+        ).order_by().values('passenger')
+        
+        rides_given = driven.annotate(total=Count('id')).values('total')
+        rides_taken = taken.annotate(total=Count('id')).values('total')
+        distance_driven = driven.annotate(total=Sum('distance')).values('total')
+        distance_taken = taken.annotate(total=Sum('ride__distance')).values('total')
+        
+        updated = User.objects.update(
+            rides_given=Coalesce(Subquery(rides_given, output_field=IntegerField()), 0),
+            rides_taken=Coalesce(Subquery(rides_taken, output_field=IntegerField()), 0),
+            total_distance=(
+                Coalesce(Subquery(distance_driven, output_field=FloatField()), 0.0)
+                + Coalesce(Subquery(distance_taken, output_field=FloatField()), 0.0)
+            )
+        )
+        
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt trip statistics for {updated} users'))
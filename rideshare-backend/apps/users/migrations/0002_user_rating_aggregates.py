@@ -0,0 +1,54 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:05
+
+from django.db import migrations, models
+from django.db.models import Case, Count, F, FloatField, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce
+
+
+def backfill_ratings(apps, schema_editor):
+    """Same computation as the rebuild_user_ratings command"""
+    Review = apps.get_model('reviews', 'Review')
+    User = apps.get_model('users', 'User')
+    received = Review.objects.filter(reviewee=OuterRef('pk')).order_by().values('reviewee')
+    User.objects.update(
+        rating_sum=Coalesce(Subquery(
+            received.annotate(total=Sum('rating')).values('total'),
+            output_field=IntegerField()
+        ), 0),
+        rating_count=Coalesce(Subquery(
+            received.annotate(total=Count('id')).values('total'),
+            output_field=IntegerField()
+        ), 0),
+    )
+    User.objects.update(rating_average=Case(
+        When(rating_count=0, then=Value(0.0)),
+        default=Cast(F('rating_sum'), FloatField()) / Cast(F('rating_count'), FloatField()),
+        output_field=FloatField()
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_initial'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='rating_average',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
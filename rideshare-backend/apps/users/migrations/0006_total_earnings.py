@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_token_revocation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='total_earnings',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+    ]
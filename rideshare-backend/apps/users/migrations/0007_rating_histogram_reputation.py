@@ -0,0 +1,89 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:46
+
+import apps.users.models
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, Count, F, FloatField, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce
+
+
+def backfill_histograms(apps, schema_editor):
+    """
+    Recompute every user's rating sum, count, average and star histogram
+    from the reviews, then the Bayesian reputation (formula inlined so the
+    migration doesn't depend on app code)
+    """
+    Review = apps.get_model('reviews', 'Review')
+    User = apps.get_model('users', 'User')
+    received = Review.objects.filter(reviewee=OuterRef('pk')).order_by().values('reviewee')
+    
+    def subquery_total(queryset, aggregate):
+        return Coalesce(Subquery(
+            queryset.annotate(total=aggregate).values('total'),
+            output_field=IntegerField()
+        ), 0)
+    
+    User.objects.update(
+        rating_sum=subquery_total(received, Sum('rating')),
+        rating_count=subquery_total(received, Count('id')),
+        **{
+            f'rating_{stars}_count': subquery_total(received.filter(rating=stars), Count('id'))
+            for stars in range(1, 6)
+        }
+    )
+    
+    weight = float(getattr(settings, 'REPUTATION_PRIOR_WEIGHT', 10))
+    prior = weight * float(getattr(settings, 'REPUTATION_PRIOR_MEAN', 4.0))
+    User.objects.update(
+        rating_average=Case(
+            When(rating_count=0, then=Value(0.0)),
+            default=Cast(F('rating_sum'), FloatField()) / Cast(F('rating_count'), FloatField()),
+            output_field=FloatField()
+        ),
+        reputation=(
+            (Cast(F('rating_sum'), FloatField()) + Value(prior))
+            / (Cast(F('rating_count'), FloatField()) + Value(weight))
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_initial'),
+        ('users', '0006_total_earnings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='reputation',
+            field=models.FloatField(db_index=True, default=apps.users.models.default_reputation),
+        ),
+        migrations.RunPython(backfill_histograms, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,14 @@
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from apps.core.models import TimeStampedModel
 
+
+def default_reputation():
+    """Reputation of a user without reviews: the prior mean"""
+    return settings.REPUTATION_PRIOR_MEAN
+
+
 class User(AbstractUser, TimeStampedModel):
     """
     Custom User model extending Django's AbstractUser
@@ -18,6 +25,28 @@ class User(AbstractUser, TimeStampedModel):
     rides_taken = models.IntegerField(default=0)
     total_distance = models.FloatField(default=0.0, help_text='Total distance in kilometers')
     
+    # Denormalized review aggregates (maintained by apps.reviews.signals)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_average = models.FloatField(default=0.0)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+    
+    # Bayesian-smoothed rating for ranking (see apps.reviews.signals.reputation_expression)
+    reputation = models.FloatField(default=default_reputation, db_index=True)
+    
+    # Denormalized unread notification count (maintained by apps.notifications.counters)
+    unread_notifications = models.PositiveIntegerField(default=0)
+    
+    # Running total of the driver's earnings ledger (apps.bookings.earnings)
+    total_earnings = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    
+    # Bumped on password changes and logout-all; tokens carrying an older version are rejected
+    token_version = models.PositiveIntegerField(default=0)
+    
     # Override username to use email
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
@@ -30,32 +59,59 @@ class User(AbstractUser, TimeStampedModel):
     def __str__(self):
         return self.email
     
+    def change_password(self, raw_password):
+        """
+        Set a new password and revoke every token issued before it. The
+        change-password endpoint uses this; hash upgrades on login go
+        through set_password alone and keep tokens valid.
+        """
+        self.set_password(raw_password)
+        self.token_version += 1
+        self.save(update_fields=['password', 'token_version'])
+    
+    def revoke_tokens(self):
+        """Invalidate every token issued to the user so far (all devices)"""
+        self.token_version += 1
+        self.save(update_fields=['token_version'])
+    
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        """
+        Users built by CachedJWTAuthentication hold only a few columns; the
+        first access to any other field loads all of them in one query
+        """
+        if fields is not None and getattr(self, '_auth_cached', False):
+            fields = set(fields) | self.get_deferred_fields()
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+    
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
     
     @property
     def rating(self):
-        """Calculate average rating from reviews"""
-        reviews = self.received_reviews.all()
-        if reviews.exists():
-            total = sum(review.rating for review in reviews)
-            return round(total / reviews.count(), 1)
-        return 0.0
+        """Average rating from the stored review aggregates"""
+        return round(self.rating_average, 1)
     
     @property
     def reviews_count(self):
         """Count of reviews received"""
-        return self.received_reviews.count()
-
+        return self.rating_count
+    
     @property
-    def total_earnings(self):
-        """Calculate total earnings from accepted bookings of rides driven"""
-        from apps.bookings.models import Booking
-        # We need to import Ride as well or use F expression correctly
-        return Booking.objects.filter(
-            ride__driver=self,
-            status='accepted'
-        ).aggregate(
-            total=models.Sum(models.F('seats') * models.F('ride__price'))
-        )['total'] or 0.0
\ No newline at end of file
+    def rating_histogram(self):
+        """Reviews received per star rating, {"1": count, ..., "5": count}"""
+        return {str(stars): getattr(self, f'rating_{stars}_count') for stars in range(1, 6)}
+
+
+class TokenRevocation(models.Model):
+    """
+    Append-only log of revoked JWTs (by jti). Mirrored in memory by
+    apps.users.revocation; rows can be pruned once expires_at has passed.
+    Revoking all of a user's tokens bumps User.token_version instead.
+    """
+    jti = models.CharField(max_length=255)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    def __str__(self):
+        return f"token {self.jti}"
@@ -0,0 +1,87 @@
+"""
+Revoked JWTs, checked in memory.
+
+Each process mirrors the TokenRevocation table of revoked token ids
+(jti). The mirror is loaded on first use, then refreshed with the rows written since
+the last sync at most every TOKEN_REVOCATION_SYNC_SECONDS, so checks are
+dictionary lookups with no query per request. Revocations made by this
+process apply immediately.
+
+Revoking every token of a user (logout-all, password changes) bumps
+User.token_version instead, checked by CachedJWTAuthentication.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from .models import TokenRevocation
+
+# Rows re-read on every sync, covering transactions that commit late
+# and clock differences between servers
+SYNC_OVERLAP = timedelta(seconds=60)
+
+# Seconds between sweeps of expired entries from memory
+PURGE_SECONDS = 600
+
+
+class RevocationStore:
+    def __init__(self):
+        self._jtis = {}          # jti -> expiry (epoch seconds)
+        self._cursor = None      # created_at lower bound of the next sync
+        self._synced = self._purged = 0.0
+        self._lock = threading.Lock()
+
+    def _add(self, jti, expires_at):
+        self._jtis[jti] = expires_at.timestamp()
+
+    def sync(self, force=False):
+        """Pull rows created since the last sync (all live rows the first time)"""
+        now = time.monotonic()
+        if not force and now - self._synced < settings.TOKEN_REVOCATION_SYNC_SECONDS:
+            return
+        if not self._lock.acquire(blocking=self._cursor is None):
+            return  # another thread is syncing; use the current state
+        try:
+            started = timezone.now()
+            rows = TokenRevocation.objects.filter(expires_at__gt=started)
+            if self._cursor is not None:
+                rows = rows.filter(created_at__gte=self._cursor)
+            for row in rows.values_list('jti', 'expires_at'):
+                self._add(*row)
+            self._cursor = started - SYNC_OVERLAP
+            self._synced = now
+            
+            if now - self._purged > PURGE_SECONDS:
+                self._purge(started.timestamp())
+                self._purged = now
+        finally:
+            self._lock.release()
+
+    def _purge(self, epoch):
+        self._jtis = {jti: expiry for jti, expiry in self._jtis.items() if expiry > epoch}
+
+    def is_revoked(self, payload):
+        """True if the token (a validated payload) is revoked"""
+        self.sync()
+        return payload.get(api_settings.JTI_CLAIM) in self._jtis
+
+    def revoke(self, jti, expires_at):
+        TokenRevocation.objects.create(jti=jti, expires_at=expires_at)
+        self._add(jti, expires_at)
+
+
+store = RevocationStore()
+
+
+def revoke_token(token):
+    """Revoke one token (refresh or access) until it expires"""
+    store.revoke(
+        jti=token[api_settings.JTI_CLAIM],
+        expires_at=datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc)
+    )
+
+
+def is_revoked(token):
+    return store.is_revoked(token.payload)
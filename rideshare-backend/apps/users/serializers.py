@@ -1,6 +1,20 @@
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from apps.core.serializers import ThumbnailsField
+from .authentication import CachedJWTAuthentication
 from .models import User
+from .revocation import is_revoked, revoke_token
+
+class ReputationField(serializers.DecimalField):
+    """The stored Bayesian reputation, rounded to two decimals"""
+
+    def __init__(self, **kwargs):
+        kwargs.update(max_digits=4, decimal_places=2, coerce_to_string=False, read_only=True)
+        super().__init__(**kwargs)
+
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """Serializer for user registration"""
@@ -38,13 +52,15 @@ class UserSerializer(serializers.ModelSerializer):
     full_name = serializers.ReadOnlyField()
     rating = serializers.ReadOnlyField()
     reviews_count = serializers.ReadOnlyField()
+    reputation = ReputationField()
     total_earnings = serializers.ReadOnlyField()
+    avatar_thumbnails = ThumbnailsField(source='avatar')
 
     class Meta:
         model = User
         fields = ('id', 'email', 'username', 'first_name', 'last_name', 
-                  'full_name', 'avatar', 'bio', 'phone_number', 'location',
-                  'is_verified', 'rating', 'reviews_count', 'total_earnings',
+                  'full_name', 'avatar', 'avatar_thumbnails', 'bio', 'phone_number', 'location',
+                  'is_verified', 'rating', 'reviews_count', 'reputation', 'total_earnings',
                   'rides_given', 'rides_taken', 'total_distance', 'date_joined')
         read_only_fields = ('id', 'email', 'is_verified', 'date_joined', 
                             'rides_given', 'rides_taken', 'total_distance',
@@ -59,16 +75,43 @@ class UserUpdateSerializer(serializers.ModelSerializer):
                   'phone_number', 'location')
 
 
+class ChangePasswordSerializer(serializers.Serializer):
+    """Serializer for changing the authenticated user's password"""
+    old_password = serializers.CharField(write_only=True, required=True)
+    new_password = serializers.CharField(write_only=True, required=True)
+    new_password_confirm = serializers.CharField(write_only=True, required=True)
+
+    def validate_old_password(self, value):
+        if not self.context['request'].user.check_password(value):
+            raise serializers.ValidationError("Current password is incorrect.")
+        return value
+
+    def validate(self, attrs):
+        if attrs['new_password'] != attrs['new_password_confirm']:
+            raise serializers.ValidationError(
+                {"new_password": "Password fields didn't match."}
+            )
+        validate_password(attrs['new_password'], self.context['request'].user)
+        return attrs
+
+    def save(self):
+        user = self.context['request'].user
+        user.change_password(self.validated_data['new_password'])
+        return user
+
+
 class UserPublicSerializer(serializers.ModelSerializer):
     """Serializer for public user information (limited fields)"""
     full_name = serializers.ReadOnlyField()
     rating = serializers.ReadOnlyField()
     reviews_count = serializers.ReadOnlyField()
+    reputation = ReputationField()
+    avatar_thumbnails = ThumbnailsField(source='avatar')
 
     class Meta:
         model = User
-        fields = ('id', 'username', 'full_name', 'avatar', 'rating', 
-                  'reviews_count', 'rides_given', 'is_verified', 'email', 'phone_number')
+        fields = ('id', 'username', 'full_name', 'avatar', 'avatar_thumbnails',
+                  'rating', 'reviews_count', 'reputation', 'rides_given', 'is_verified', 'email', 'phone_number')
 
 
 class UserStatsSerializer(serializers.ModelSerializer):
@@ -76,8 +119,39 @@ class UserStatsSerializer(serializers.ModelSerializer):
     full_name = serializers.ReadOnlyField()
     rating = serializers.ReadOnlyField()
     reviews_count = serializers.ReadOnlyField()
+    reputation = ReputationField()
+    rating_histogram = serializers.ReadOnlyField()
+    avatar_thumbnails = ThumbnailsField(source='avatar')
 
     class Meta:
         model = User
-        fields = ('id', 'full_name', 'avatar', 'rating', 'reviews_count',
-                  'rides_given', 'rides_taken', 'total_distance', 'date_joined')
\ No newline at end of file
+        fields = ('id', 'full_name', 'avatar', 'avatar_thumbnails', 'rating', 'reviews_count',
+                  'reputation', 'rating_histogram', 'rides_given', 'rides_taken',
+                  'total_distance', 'date_joined')
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Token refresh checked against the in-memory revocation store and the
+    cached user record instead of the database
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if is_revoked(refresh):
+            raise InvalidToken('Token has been revoked')
+        
+        # Active flag and token version, from the auth cache
+        CachedJWTAuthentication().get_user(refresh)
+        
+        data = {'access': str(refresh.access_token)}
+        
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            if jwt_settings.BLACKLIST_AFTER_ROTATION:
+                revoke_token(refresh)
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        
+        return data
@@ -0,0 +1,27 @@
+from django.core.cache import cache
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+from apps.core import images
+from .authentication import cache_key
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user(sender, instance, update_fields=None, **kwargs):
+    """Drop the cached auth record on profile, password or is_active changes"""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    cache.delete(cache_key(instance.pk))
+
+
+@receiver(pre_save, sender=User)
+def track_avatar_upload(sender, instance, **kwargs):
+    instance._pending_images = images.pending_uploads(instance, ['avatar'])
+
+
+@receiver(post_save, sender=User)
+def process_avatar_upload(sender, instance, **kwargs):
+    """Strip metadata and make square thumbnails of a new avatar"""
+    if getattr(instance, '_pending_images', None):
+        images.schedule(instance.avatar, crop=True)
+        instance._pending_images = []
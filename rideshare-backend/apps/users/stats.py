@@ -0,0 +1,61 @@
+"""
+Trip statistics stored on User, kept current by the ride and booking
+events that change them:
+
+- rides_given: completed rides driven
+- rides_taken: accepted bookings on completed rides
+- total_distance: distance of those rides, as driver or passenger
+
+The rebuild_user_stats command recomputes them from scratch
+"""
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from .models import User
+
+
+def ride_status_changed(ride, old_status):
+    """Count a ride that became completed, or uncount one that no longer is"""
+    from apps.bookings.models import Booking
+    
+    was_completed = old_status == 'completed'
+    if was_completed == (ride.status == 'completed'):
+        return
+    
+    sign = -1 if was_completed else 1
+    _apply(User.objects.filter(pk=ride.driver_id), 'rides_given', sign, ride.distance)
+    passengers = Booking.objects.filter(
+        ride_id=ride.pk,
+        status='accepted'
+    ).values('passenger_id')
+    _apply(User.objects.filter(pk__in=passengers), 'rides_taken', sign, ride.distance)
+
+
+def bookings_changed(ride_id, passenger_ids, sign):
+    """
+    Count (sign=1) or uncount (sign=-1) passengers' bookings on a ride
+    that were accepted or cancelled; only rides stored as completed count.
+    
+    The ride row is locked first: a concurrent completion either commits
+    before (its status is read here) or waits for this transaction (and
+    then sees these bookings), so each booking is counted exactly once.
+    """
+    from apps.rides.models import Ride
+    
+    if not passenger_ids:
+        return
+    with transaction.atomic():
+        status, distance = Ride.objects.select_for_update().filter(
+            pk=ride_id
+        ).values_list('status', 'distance').first() or (None, None)
+        if status == 'completed':
+            _apply(User.objects.filter(pk__in=passenger_ids), 'rides_taken', sign, distance)
+
+
+def _apply(users, counter, sign, distance):
+    """Move a counter and total_distance of the selected users, never below zero"""
+    users.update(**{
+        counter: Greatest(F(counter) + sign, 0),
+        'total_distance': Greatest(F('total_distance') + sign * (distance or 0.0), 0.0),
+    })
+
@@ -1,3 +1,76 @@
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+from .admin import TokenRevokingPasswordChangeForm
+from .models import User
 
-# Create your tests here.
+
+class TokenVersionTests(TestCase):
+    """Tokens survive password hash upgrades but not password changes"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='rider@example.com', username='rider', password='old-password'
+        )
+
+    def login(self, password):
+        response = self.client.post(
+            '/api/users/login/', {'email': self.user.email, 'password': password}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data['access']
+
+    def me(self, access):
+        return self.client.get('/api/users/me/', HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def test_login_upgrading_password_hash_keeps_token_valid(self):
+        hasher = PBKDF2PasswordHasher()
+        weak_hash = hasher.encode('old-password', hasher.salt(), iterations=1000)
+        User.objects.filter(pk=self.user.pk).update(password=weak_hash)
+
+        access = self.login('old-password')
+
+        self.assertNotEqual(User.objects.get(pk=self.user.pk).password, weak_hash)
+        self.assertEqual(self.me(access).status_code, 200)
+
+    def change_password(self, access, old_password):
+        return self.client.post('/api/users/change-password/', {
+            'old_password': old_password,
+            'new_password': 'An0ther-passw0rd',
+            'new_password_confirm': 'An0ther-passw0rd'
+        }, HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def test_change_password_revokes_tokens(self):
+        access = self.login('old-password')
+
+        changed = self.change_password(access, 'old-password')
+        self.assertEqual(changed.status_code, 200)
+
+        response = self.me(access)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data['code'], 'token_outdated')
+        self.assertEqual(self.me(changed.data['access']).status_code, 200)
+        self.assertEqual(self.me(self.login('An0ther-passw0rd')).status_code, 200)
+
+    def test_change_password_requires_current_password(self):
+        access = self.login('old-password')
+
+        response = self.change_password(access, 'wrong-password')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('old_password', response.data)
+        self.assertEqual(self.me(access).status_code, 200)
+
+    def test_admin_password_change_revokes_tokens(self):
+        access = self.login('old-password')
+
+        form = TokenRevokingPasswordChangeForm(self.user, {
+            'password1': 'An0ther-passw0rd', 'password2': 'An0ther-passw0rd'
+        })
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+
+        self.assertEqual(self.me(access).status_code, 401)
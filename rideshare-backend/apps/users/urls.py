@@ -4,9 +4,12 @@ from .views import (
     UserRegistrationView,
     UserLoginView,
     CurrentUserView,
+    ChangePasswordView,
     UserDetailView,
+    UserStatsListView,
     UserStatsView,
-    logout_view
+    logout_view,
+    logout_all_view
 )
 
 app_name = 'users'
@@ -16,10 +19,13 @@ urlpatterns = [
     path('register/', UserRegistrationView.as_view(), name='register'),
     path('login/', UserLoginView.as_view(), name='login'),
     path('logout/', logout_view, name='logout'),
+    path('logout-all/', logout_all_view, name='logout-all'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     
     # User Profile
     path('me/', CurrentUserView.as_view(), name='current-user'),
+    path('change-password/', ChangePasswordView.as_view(), name='change-password'),
+    path('stats/', UserStatsListView.as_view(), name='user-stats-list'),
     path('<int:pk>/', UserDetailView.as_view(), name='user-detail'),
     path('<int:pk>/stats/', UserStatsView.as_view(), name='user-stats'),
 ]
\ No newline at end of file
@@ -1,16 +1,21 @@
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.filters import OrderingFilter
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
+from .authentication import VersionedRefreshToken
 from .models import User
+from .revocation import revoke_token
 from .serializers import (
     UserRegistrationSerializer, 
     UserSerializer, 
     UserUpdateSerializer,
     UserPublicSerializer,
-    UserStatsSerializer
+    UserStatsSerializer,
+    ChangePasswordSerializer
 )
 
 
@@ -66,7 +71,7 @@ class UserLoginView(APIView):
             )
 
         # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = VersionedRefreshToken.for_user(user)
 
         return Response({
             'access': str(refresh.access_token),
@@ -83,6 +88,9 @@ class CurrentUserView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
+        # Updates start from a fresh row, not the auth-cached user
+        if self.request.method in ['PUT', 'PATCH']:
+            return User.objects.get(pk=self.request.user.pk)
         return self.request.user
 
     def get_serializer_class(self):
@@ -91,6 +99,31 @@ class CurrentUserView(generics.RetrieveUpdateAPIView):
         return UserSerializer
 
 
+class ChangePasswordView(APIView):
+    """
+    POST /api/users/change-password/
+    Change the current user's password. Every token issued before the
+    change is revoked; fresh tokens for this device are returned.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = ChangePasswordSerializer(
+            data=request.data,
+            context={'request': request}
+        )
+        serializer.is_valid(raise_exception=True)
+        user = serializer.save()
+        
+        refresh = VersionedRefreshToken.for_user(user)
+        
+        return Response({
+            'access': str(refresh.access_token),
+            'refresh': str(refresh),
+            'message': 'Password changed successfully'
+        }, status=status.HTTP_200_OK)
+
+
 class UserDetailView(generics.RetrieveAPIView):
     """
     GET /api/users/<id>/ - Get public user profile
@@ -100,6 +133,35 @@ class UserDetailView(generics.RetrieveAPIView):
     permission_classes = [permissions.AllowAny]
 
 
+class UserStatsListView(generics.ListAPIView):
+    """
+    GET /api/users/stats/ - User statistics, best reputation first
+    Query params: ?min_reputation=4.5&min_reviews=10
+    &ordering=-reputation (or rides_given, rating_count)
+    """
+    serializer_class = UserStatsSerializer
+    permission_classes = [permissions.AllowAny]
+    filter_backends = [OrderingFilter]
+    ordering_fields = ['reputation', 'rides_given', 'rating_count']
+    ordering = ['-reputation', 'id']
+    
+    def get_queryset(self):
+        queryset = User.objects.filter(is_active=True)
+        
+        min_reputation = self.request.query_params.get('min_reputation')
+        if min_reputation:
+            try:
+                queryset = queryset.filter(reputation__gte=float(min_reputation))
+            except ValueError:
+                pass
+        
+        min_reviews = self.request.query_params.get('min_reviews')
+        if min_reviews and min_reviews.isdigit():
+            queryset = queryset.filter(rating_count__gte=int(min_reviews))
+        
+        return queryset
+
+
 class UserStatsView(generics.RetrieveAPIView):
     """
     GET /api/users/<id>/stats/ - Get user statistics
@@ -114,19 +176,36 @@ class UserStatsView(generics.RetrieveAPIView):
 def logout_view(request):
     """
     POST /api/users/logout/
-    Logout user (blacklist refresh token if implemented)
-    """
-    try:
-        refresh_token = request.data.get('refresh')
-        if refresh_token:
-            token = RefreshToken(refresh_token)
-            token.blacklist()
-        return Response(
-            {'message': 'Logout successful'},
-            status=status.HTTP_200_OK
-        )
-    except Exception:
-        return Response(
-            {'error': 'Invalid token'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
\ No newline at end of file
+    Logout user: revoke the refresh token (if sent) and the access token
+    """
+    refresh_token = request.data.get('refresh')
+    if refresh_token:
+        try:
+            revoke_token(RefreshToken(refresh_token))
+        except TokenError:
+            return Response(
+                {'error': 'Invalid token'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    if request.auth is not None:
+        revoke_token(request.auth)
+    
+    return Response(
+        {'message': 'Logout successful'},
+        status=status.HTTP_200_OK
+    )
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def logout_all_view(request):
+    """
+    POST /api/users/logout-all/
+    Revoke every token issued to the user so far (all devices)
+    by bumping their token version
+    """
+    request.user.revoke_tokens()
+    return Response(
+        {'message': 'Logged out on all devices'},
+        status=status.HTTP_200_OK
+    )
@@ -2,7 +2,7 @@
 
 from pathlib import Path
 from datetime import timedelta
-from decouple import config
+from decouple import Csv, config
 
 # Build paths inside the project
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -115,13 +115,18 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Square/fitted WebP thumbnails written next to uploaded avatars and car
+# photos (apps.core.images), by this many worker threads per process
+IMAGE_THUMBNAIL_SIZES = config('IMAGE_THUMBNAIL_SIZES', default='64,128,512', cast=Csv(int))
+IMAGE_PROCESSING_WORKERS = config('IMAGE_PROCESSING_WORKERS', default=2, cast=int)
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Django REST Framework Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
@@ -131,11 +136,51 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'apps.core.pagination.KeysetPagination',
     'PAGE_SIZE': 10,
     'DATETIME_FORMAT': '%Y-%m-%dT%H:%M:%SZ',
 }
 
+# Cache (local memory by default; any Django backend works, e.g. file-based)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='rideshare'),
+    }
+}
+
+# Seconds a cached ride search page may live; writes invalidate it sooner.
+# In production this needs a CACHE_BACKEND shared by all workers, such as
+# the file-based or database cache (check --deploy, rides.E001); 0 disables
+RIDE_SEARCH_CACHE_TIMEOUT = config('RIDE_SEARCH_CACHE_TIMEOUT', default=300, cast=int)
+
+# Notification push (SSE at /api/notifications/stream/, ASGI only).
+# Events reach every server process through 'postgres' (LISTEN/NOTIFY),
+# 'socket' (UDP between processes on one host) or 'local' (one process)
+NOTIFICATION_EVENTS_TRANSPORT = config('NOTIFICATION_EVENTS_TRANSPORT', default='postgres')
+
+# Seconds between keepalive comments on idle streams
+NOTIFICATION_STREAM_KEEPALIVE = 25
+
+# Seconds a single-use stream ticket (POST /api/notifications/stream/ticket/)
+# stays valid; tickets are kept in the default cache
+NOTIFICATION_STREAM_TICKET_SECONDS = config('NOTIFICATION_STREAM_TICKET_SECONDS', default=30, cast=int)
+
+# Merge same-type notifications for one recipient and ride created within
+# this many seconds into a single row (0 disables)
+NOTIFICATION_COALESCE_WINDOW = config('NOTIFICATION_COALESCE_WINDOW', default=600, cast=int)
+
+# Low-priority types held back and delivered as one digest per recipient
+# by `manage.py dispatch_notifications --digest` (e.g. from cron),
+# e.g. NOTIFICATION_DIGEST_TYPES=request_declined,booking_cancelled
+NOTIFICATION_DIGEST_TYPES = config('NOTIFICATION_DIGEST_TYPES', default='', cast=Csv())
+
+# Read notifications older than this many days are moved to the archive
+# table (or dropped when NOTIFICATION_ARCHIVE is off) by
+# `manage.py prune_notifications`
+NOTIFICATION_RETENTION_DAYS = config('NOTIFICATION_RETENTION_DAYS', default=90, cast=int)
+NOTIFICATION_ARCHIVE = config('NOTIFICATION_ARCHIVE', default=True, cast=bool)
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
@@ -145,7 +190,37 @@ SIMPLE_JWT = {
     'UPDATE_LAST_LOGIN': True,
     'ALGORITHM': 'HS256',
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_REFRESH_SERIALIZER': 'apps.users.serializers.RevocableTokenRefreshSerializer',
+}
+
+# User.reputation is the average rating after adding REPUTATION_PRIOR_WEIGHT
+# (> 0) virtual reviews at REPUTATION_PRIOR_MEAN stars. Run
+# rebuild_user_ratings after changing either
+REPUTATION_PRIOR_MEAN = config('REPUTATION_PRIOR_MEAN', default=4.0, cast=float)
+REPUTATION_PRIOR_WEIGHT = config('REPUTATION_PRIOR_WEIGHT', default=10, cast=float)
+
+# Ride search ?ordering=relevance (apps.rides.ranking): weight of each
+# 0..1 signal, the hours from the requested time and the price at which
+# the time and price signals halve, and how many ranked rides are returned
+RIDE_RELEVANCE_WEIGHTS = {
+    'time': config('RIDE_RELEVANCE_WEIGHT_TIME', default=3.0, cast=float),
+    'price': config('RIDE_RELEVANCE_WEIGHT_PRICE', default=1.0, cast=float),
+    'seats': config('RIDE_RELEVANCE_WEIGHT_SEATS', default=0.5, cast=float),
+    'instant': config('RIDE_RELEVANCE_WEIGHT_INSTANT', default=0.5, cast=float),
+    'reputation': config('RIDE_RELEVANCE_WEIGHT_REPUTATION', default=2.0, cast=float),
 }
+RIDE_RELEVANCE_TIME_SCALE_HOURS = config('RIDE_RELEVANCE_TIME_SCALE_HOURS', default=6.0, cast=float)
+RIDE_RELEVANCE_PRICE_SCALE = config('RIDE_RELEVANCE_PRICE_SCALE', default=20.0, cast=float)
+RIDE_RELEVANCE_MAX_RESULTS = config('RIDE_RELEVANCE_MAX_RESULTS', default=100, cast=int)
+
+# Seconds the id / is_active / token_version of an authenticated user is
+# cached. User saves clear it; with a per-process cache (locmem), other
+# processes may see a change only after this long
+AUTH_USER_CACHE_TIMEOUT = config('AUTH_USER_CACHE_TIMEOUT', default=60, cast=int)
+
+# Seconds between syncs of the in-memory token revocation set
+# (apps.users.revocation) with the TokenRevocation table
+TOKEN_REVOCATION_SYNC_SECONDS = config('TOKEN_REVOCATION_SYNC_SECONDS', default=5, cast=int)
 
 # CORS Settings
 CORS_ALLOWED_ORIGINS = config(